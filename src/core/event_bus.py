@@ -5,7 +5,9 @@
 """
 from typing import Callable, Dict, List, Any, Optional
 import asyncio
+import itertools
 import logging
+from collections import deque
 from datetime import datetime
 from enum import Enum
 
@@ -53,9 +55,9 @@ class EventBus:
     def __init__(self):
         # 订阅者：type -> [callbacks]
         self._subscribers: Dict[str, List[Callable]] = {}
-        # 事件历史
-        self._event_history: List[Dict] = []
+        # 事件历史（环形缓冲，超出上限自动丢弃最旧事件）
         self._max_history = 1000
+        self._event_history: deque = deque(maxlen=self._max_history)
         # 事件队列（保证顺序）
         self._event_queue: asyncio.Queue = asyncio.Queue()
         # 是否正在处理队列
@@ -94,8 +96,6 @@ class EventBus:
 
         # 记录事件历史
         self._event_history.append(event)
-        if len(self._event_history) > self._max_history:
-            self._event_history.pop(0)
 
         logger.debug(f"Publishing event: {event_type}")
 
@@ -132,13 +132,18 @@ class EventBus:
         self._processing = False
 
     def get_event_history(self, event_type: str = None, limit: int = 100):
-        """获取事件历史"""
+        """获取事件历史（按时间正序，最多 limit 条）"""
+        if limit <= 0:
+            return []
+
+        # 从最新事件向前扫描，取满 limit 条即停止
+        events = reversed(self._event_history)
         if event_type:
-            events = [e for e in self._event_history if e["type"] == event_type]
-        else:
-            events = self._event_history
+            events = (e for e in events if e["type"] == event_type)
 
-        return events[-limit:]
+        recent = list(itertools.islice(events, limit))
+        recent.reverse()
+        return recent
 
     def clear_history(self):
         """清空事件历史"""
@@ -0,0 +1,29 @@
+"""
+事件循环配置
+优先使用 uvloop（libuv 实现）替换默认 asyncio 事件循环
+"""
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def install_uvloop() -> bool:
+    """
+    安装 uvloop 事件循环策略
+
+    必须在 asyncio.run() 之前调用。uvloop 由 uvicorn[standard] 附带安装，
+    未安装（如 Windows）时回退到默认事件循环。
+
+    Returns:
+        是否成功启用 uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop 未安装，使用默认 asyncio 事件循环")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("已启用 uvloop 事件循环")
+    return True
@@ -85,6 +85,8 @@ class PositionManager:
     def __init__(self):
         self._positions: Dict[str, Position] = {}
         self._closed_positions: List[Position] = []
+        # 各交易对净仓位（多头 - 空头），开平仓时增量维护
+        self._net_sizes: Dict[str, float] = {}
 
     def open_position(self, symbol: str, side: PositionSide, size: float,
                      entry_price: float) -> Position:
@@ -99,6 +101,7 @@ class PositionManager:
                         entry_price * size) / total_size
             existing_pos.size = total_size
             existing_pos.entry_price = avg_price
+            self._update_net_size(symbol, side, size)
             logger.info(f"Position accumulated: {symbol} {side.value} "
                        f"New size: {total_size}")
             return existing_pos
@@ -106,6 +109,7 @@ class PositionManager:
         # 创建新仓位
         position = Position(symbol, side, size, entry_price)
         self._positions[key] = position
+        self._update_net_size(symbol, side, size)
         logger.info(f"Position opened: {symbol} {side.value} Size: {size}")
         return position
 
@@ -118,10 +122,21 @@ class PositionManager:
             return None
 
         position = self._positions.pop(key)
+        opposite = PositionSide.SHORT if side == PositionSide.LONG else PositionSide.LONG
+        if f"{symbol}_{opposite.value}" in self._positions:
+            self._update_net_size(symbol, side, -position.size)
+        else:
+            # 该交易对已无持仓：直接移除净仓位，避免多空交替开平后残留浮点误差（如 1e-17）
+            self._net_sizes.pop(symbol, None)
         position.close(exit_price)
         self._closed_positions.append(position)
         return position
 
+    def _update_net_size(self, symbol: str, side: PositionSide, size: float):
+        """增量更新净仓位"""
+        delta = size if side == PositionSide.LONG else -size
+        self._net_sizes[symbol] = self._net_sizes.get(symbol, 0) + delta
+
     def get_position(self, symbol: str, side: PositionSide) -> Optional[Position]:
         """获取仓位"""
         key = f"{symbol}_{side.value}"
@@ -157,6 +172,10 @@ class PositionManager:
                 sizes[position.side.value] = position.size
         return sizes
 
+    def get_net_position_size(self, symbol: str) -> float:
+        """获取特定交易对的净仓位（多头 - 空头），无需遍历仓位"""
+        return self._net_sizes.get(symbol, 0.0)
+
     def to_dict(self) -> Dict:
         """转换为字典"""
         return {
@@ -3,7 +3,7 @@
 所有交易策略的基础框架
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, Tuple
 from datetime import datetime
 import asyncio
 import logging
@@ -105,6 +105,15 @@ class StrategyBase(ABC):
         """订单簿更新回调（由子类实现）"""
         pass
 
+    @staticmethod
+    def _unpack_ticker(ticker: Dict) -> Tuple[float, float, float]:
+        """一次性取出行情的 (bid, ask, last) 并转换为 float"""
+        return (
+            float(ticker.get("bid", 0)),
+            float(ticker.get("ask", 0)),
+            float(ticker.get("last", 0))
+        )
+
     async def _on_order_filled(self, data: Dict):
         """订单成交回调"""
         order_id = data.get("order_id")
@@ -118,23 +127,21 @@ class StrategyBase(ABC):
             price = order_info.get("price")
             symbol = order_info.get("symbol")
 
+            # 订单方向（buy/sell）映射为仓位方向：买入开多 / 平空，卖出开空 / 平多
+            if side == "buy":
+                open_side, opposite_side = PositionSide.LONG, PositionSide.SHORT
+            else:
+                open_side, opposite_side = PositionSide.SHORT, PositionSide.LONG
+
             # 判断是开仓还是平仓
-            position = self.position_manager.get_position(symbol,
-                                                        PositionSide(side))
-            if position:
+            if self.position_manager.get_position(symbol, opposite_side):
                 # 平仓
-                if (position.side == PositionSide.LONG and side == "sell") or \
-                   (position.side == PositionSide.SHORT and side == "buy"):
-                    closed_pos = self.position_manager.close_position(
-                        symbol, PositionSide(side), price
-                    )
-                    if closed_pos:
-                        self.risk_manager.update_daily_pnl(closed_pos.realized_pnl)
+                closed_pos = self.position_manager.close_position(symbol, opposite_side, price)
+                if closed_pos:
+                    self.risk_manager.update_daily_pnl(closed_pos.realized_pnl)
             else:
                 # 开仓
-                self.position_manager.open_position(
-                    symbol, PositionSide(side), size, price
-                )
+                self.position_manager.open_position(symbol, open_side, size, price)
 
             # 更新止损止盈
             await self._update_risk_orders(symbol, side, price)
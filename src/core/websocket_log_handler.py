@@ -5,27 +5,50 @@
 import logging
 import json
 import asyncio
-from typing import List
+import itertools
+from collections import deque
+from typing import Deque, List, Optional, Set
 from datetime import datetime
 
+from .ws_broadcast import broadcast_text
+
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """序列化为 JSON 文本"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
 
 class WebSocketLogHandler(logging.Handler):
-    """WebSocket 日志处理器"""
+    """WebSocket 日志处理器（日志按 flush_interval 合并为 JSON 数组推送）"""
 
-    def __init__(self):
+    def __init__(self, flush_interval: float = 0.05):
         super().__init__()
-        self.websocket_clients: List = []
-        self.log_buffer: List[dict] = []
+        self.websocket_clients: Set = set()
         self.max_buffer_size = 1000  # 最多保存 1000 条日志
+        self.log_buffer: Deque[dict] = deque(maxlen=self.max_buffer_size)
+        # 与 log_buffer 平行的已序列化日志，推送和新连接回放时直接拼接，无需重复序列化
+        self._log_texts: Deque[str] = deque(maxlen=self.max_buffer_size)
+
+        # 待推送日志（已序列化），flush_interval 秒内的日志合并为一帧发送
+        self.flush_interval = flush_interval
+        self._pending_logs: List[str] = []
+        self._flush_task: Optional[asyncio.Task] = None
 
     def add_client(self, websocket):
         """添加 WebSocket 客户端"""
-        self.websocket_clients.append(websocket)
+        self.websocket_clients.add(websocket)
 
     def remove_client(self, websocket):
         """移除 WebSocket 客户端"""
-        if websocket in self.websocket_clients:
-            self.websocket_clients.remove(websocket)
+        self.websocket_clients.discard(websocket)
 
     def emit(self, record):
         """发送日志消息"""
@@ -40,29 +63,43 @@ class WebSocketLogHandler(logging.Handler):
                 "line": record.lineno
             }
 
-            # 添加到缓冲区
+            # 添加到缓冲区（每条日志只序列化一次）
+            log_text = _dumps(log_entry)
             self.log_buffer.append(log_entry)
-            if len(self.log_buffer) > self.max_buffer_size:
-                self.log_buffer.pop(0)
+            self._log_texts.append(log_text)
 
-            # 异步推送到所有客户端
-            asyncio.create_task(self._broadcast_log(log_entry))
+            # 有客户端时加入待推送队列，由后台任务合并发送
+            if self.websocket_clients:
+                self._pending_logs.append(log_text)
+                self._ensure_flush_task()
         except Exception as e:
             pass
 
-    async def _broadcast_log(self, log_entry: dict):
-        """广播日志到所有客户端"""
+    def _ensure_flush_task(self):
+        """确保有一个延迟推送任务在运行（非事件循环线程中的日志等下次再推送）"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        """每隔 flush_interval 推送累积的日志，直到没有待推送日志（推送期间产生的日志不会滞留）"""
+        while self._pending_logs:
+            await asyncio.sleep(self.flush_interval)
+            logs, self._pending_logs = self._pending_logs, []
+            if logs:
+                await self._broadcast_logs(logs)
+
+    async def _broadcast_logs(self, logs: List[str]):
+        """以 JSON 数组的形式广播一批已序列化的日志到所有客户端"""
         if not self.websocket_clients:
             return
 
-        message = json.dumps(log_entry)
-        disconnected_clients = []
-
-        for client in self.websocket_clients:
-            try:
-                await client.send_text(message)
-            except Exception as e:
-                disconnected_clients.append(client)
+        message = "[" + ",".join(logs) + "]"
+        disconnected_clients = await broadcast_text(self.websocket_clients, message)
 
         # 移除断开的客户端
         for client in disconnected_clients:
@@ -70,7 +107,16 @@ class WebSocketLogHandler(logging.Handler):
 
     def get_recent_logs(self, count: int = 100) -> List[dict]:
         """获取最近的日志"""
-        return self.log_buffer[-count:]
+        start = max(len(self.log_buffer) - count, 0)
+        return list(itertools.islice(self.log_buffer, start, None))
+
+    def get_recent_logs_message(self, count: int = 100) -> Optional[str]:
+        """获取最近的日志，拼接为 JSON 数组文本（无日志时返回 None）"""
+        start = max(len(self._log_texts) - count, 0)
+        recent = list(itertools.islice(self._log_texts, start, None))
+        if not recent:
+            return None
+        return "[" + ",".join(recent) + "]"
 
 
 # 全局日志处理器
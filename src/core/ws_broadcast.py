@@ -0,0 +1,46 @@
+"""
+WebSocket 广播工具
+按批次并发发送，批次之间让出事件循环，避免大量客户端时阻塞 HTTP 请求
+"""
+import asyncio
+from typing import Iterable, List, Union
+
+# 每批并发发送的客户端数量
+BROADCAST_BATCH_SIZE = 50
+
+# 单个客户端发送超时（秒），超时视为发送失败，避免卡住的连接拖慢整批广播
+SEND_TIMEOUT = 1.0
+
+
+async def broadcast_text(clients: Iterable, message: str) -> List:
+    """
+    向一组 WebSocket 客户端广播文本消息
+
+    Args:
+        clients: WebSocket 客户端集合
+        message: 已序列化的消息文本
+
+    Returns:
+        发送失败的客户端列表（由调用方移除）
+    """
+    return await _broadcast(clients, "send_text", message)
+
+
+async def _broadcast(clients: Iterable, send_method: str, payload: Union[str, bytes]) -> List:
+    """按批次并发调用每个客户端的 send_method 发送 payload"""
+    clients = list(clients)
+    failed = []
+
+    for start in range(0, len(clients), BROADCAST_BATCH_SIZE):
+        if start:
+            # 批次之间让出事件循环
+            await asyncio.sleep(0)
+
+        batch = clients[start:start + BROADCAST_BATCH_SIZE]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(getattr(client, send_method)(payload), timeout=SEND_TIMEOUT) for client in batch),
+            return_exceptions=True
+        )
+        failed.extend(client for client, result in zip(batch, results) if isinstance(result, Exception))
+
+    return failed
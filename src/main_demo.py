@@ -30,6 +30,7 @@ import random
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.core.event_bus import EventBus
+from src.core.event_loop import install_uvloop
 from src.core.position import PositionManager, PositionSide
 from src.core.risk_manager import RiskManager
 from src.strategies.market_maker import MarketMakerStrategy
@@ -62,7 +63,9 @@ def setup_logging(log_level: str = "INFO"):
 class MockExchange:
     """模拟交易所（演示模式）"""
 
-    def __init__(self):
+    def __init__(self, event_bus=None):
+        # 订单成交时在事件总线上发布 order_filled（策略据此确认成交、更新仓位）
+        self.event_bus = event_bus
         self.orders = {}
         self.order_id_counter = 0
         self.current_price = 50000.0
@@ -132,6 +135,15 @@ class MockExchange:
                 self.balances["BTC"] -= size
                 self.balances["USDT"] += size * price
 
+            if self.event_bus:
+                await self.event_bus.publish("order_filled", {
+                    "order_id": order_id,
+                    "symbol": symbol,
+                    "side": side,
+                    "size": size,
+                    "price": price
+                })
+
         return order_id
 
     async def cancel_order(self, order_id, symbol=None):
@@ -184,7 +196,7 @@ class HummingbotLite:
             'take_profit_percentage': 0.03,
             'max_daily_loss': 0.05
         })
-        self.exchange = MockExchange() if demo_mode else None
+        self.exchange = MockExchange(self.event_bus) if demo_mode else None
         self.strategy = None
         self.web_server = None
 
@@ -353,6 +365,9 @@ def main():
     # 创建并运行机器人
     bot = HummingbotLite(demo_mode=True)
 
+    # 使用 uvloop 加速策略事件循环（未安装时回退默认循环）
+    install_uvloop()
+
     try:
         asyncio.run(bot.run())
     except KeyboardInterrupt:
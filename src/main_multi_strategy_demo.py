@@ -21,6 +21,7 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.core.event_bus import EventBus
+from src.core.event_loop import install_uvloop
 from src.core.position import PositionManager
 from src.core.risk_manager import RiskManager
 from src.core.strategy_manager import StrategyManager
@@ -58,7 +59,9 @@ def setup_logging(log_level: str = "INFO"):
 class MockExchange:
     """模拟交易所（演示模式）"""
 
-    def __init__(self):
+    def __init__(self, event_bus=None):
+        # 订单成交时在事件总线上发布 order_filled（策略据此确认成交、更新仓位）
+        self.event_bus = event_bus
         self.orders = {}
         self.order_id_counter = 0
         self.current_price = 50000.0
@@ -130,6 +133,15 @@ class MockExchange:
                 self.balances["BTC"] -= size
                 self.balances["USDT"] += size * price
 
+            if self.event_bus:
+                await self.event_bus.publish("order_filled", {
+                    "order_id": order_id,
+                    "symbol": symbol,
+                    "side": side,
+                    "size": size,
+                    "price": price
+                })
+
         return order_id
 
     async def cancel_order(self, order_id, symbol=None):
@@ -189,7 +201,7 @@ class HummingbotLiteMultiStrategy:
         )
 
         # 模拟交易所
-        self.exchange = MockExchange()
+        self.exchange = MockExchange(self.event_bus)
 
         # 设置策略管理器的交易所回调
         self.strategy_manager.set_exchange_callbacks({
@@ -354,6 +366,9 @@ def main():
     # 创建并运行机器人
     bot = HummingbotLiteMultiStrategy(demo_mode=True, ws_log_handler=ws_log_handler)
 
+    # 使用 uvloop 加速策略事件循环（未安装时回退默认循环）
+    install_uvloop()
+
     try:
         asyncio.run(bot.run())
     except KeyboardInterrupt:
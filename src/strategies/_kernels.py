@@ -0,0 +1,80 @@
+"""
+策略数值计算内核
+float64 标量运算，安装 numba 时按显式签名在导入时编译（cache=True 缓存到磁盘），
+策略启动后的首个 tick 不再触发 JIT 编译；未安装 numba 时使用纯 Python 实现
+"""
+try:
+    from numba import njit
+except ImportError:
+    # numba 为可选依赖，未安装时退化为纯 Python 函数
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# 套利方向编码
+ARB_NONE = 0
+ARB_BUY_SPOT_SELL_PERP = 1
+ARB_BUY_PERP_SELL_SPOT = 2
+
+
+@njit('Tuple((i8, f8, f8, f8))(f8, f8, f8, f8, f8, f8, f8)', cache=True, fastmath=True)
+def scan_arb(spot_bid, spot_ask, perp_bid, perp_ask, min_pct, spot_buf, perp_buf):
+    """
+    扫描现货永续套利机会
+
+    Returns:
+        (方向编码, 买入价, 卖出价, 预期利润率)，无机会时方向编码为 ARB_NONE
+    """
+    if spot_bid == 0.0 or spot_ask == 0.0 or perp_bid == 0.0 or perp_ask == 0.0:
+        return ARB_NONE, 0.0, 0.0, 0.0
+
+    # 情况1: 现货买 + 永续卖（现货价格低于永续）
+    if spot_ask < perp_bid:
+        profit_pct = (perp_bid - spot_ask) / spot_ask
+        if profit_pct >= min_pct:
+            return (ARB_BUY_SPOT_SELL_PERP,
+                    spot_ask * (1.0 + spot_buf),
+                    perp_bid * (1.0 - perp_buf),
+                    profit_pct)
+
+    # 情况2: 现货卖 + 永续买（现货价格高于永续）
+    if spot_bid > perp_ask:
+        profit_pct = (spot_bid - perp_ask) / perp_ask
+        if profit_pct >= min_pct:
+            return (ARB_BUY_PERP_SELL_SPOT,
+                    perp_ask * (1.0 + perp_buf),
+                    spot_bid * (1.0 - spot_buf),
+                    profit_pct)
+
+    return ARB_NONE, 0.0, 0.0, 0.0
+
+
+@njit('f8(b1, f8, f8, f8, f8)', cache=True, fastmath=True)
+def calc_arb_profit(buy_spot, spot_bid, spot_ask, perp_bid, perp_ask):
+    """计算当前套利仓位的价差利润率"""
+    if buy_spot:
+        # 现货买 + 永续卖
+        return (perp_bid - spot_ask) / spot_ask
+    # 现货卖 + 永续买
+    return (spot_bid - perp_ask) / perp_ask
+
+
+@njit('UniTuple(f8, 2)(f8, f8, f8, f8, f8)', cache=True, fastmath=True)
+def calc_inventory_skew(base_balance, quote_balance, inventory_price,
+                        target_base_pct, range_multiplier):
+    """
+    计算库存偏差对买卖价差的调整
+
+    Returns:
+        (买单调整, 卖单调整)
+    """
+    if quote_balance == 0.0:
+        return 0.0, 0.0
+
+    current_base_pct = base_balance * inventory_price / quote_balance
+    deviation = (current_base_pct - target_base_pct) / range_multiplier
+
+    # 偏多时增加买单调整，偏空时增加卖单调整
+    return max(0.0, deviation), max(0.0, -deviation)
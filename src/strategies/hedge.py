@@ -47,6 +47,9 @@ class HedgeStrategy(StrategyBase):
         # 交易对
         self.spot_trading_pair = config.get('spot_trading_pair', 'BTC-USDT')
         self.perp_trading_pair = config.get('perp_trading_pair', 'BTC-USDT-SWAP')
+        # 交易对运行期不变，预先计算基础资产和永续下单键
+        self._base_asset = self.spot_trading_pair.split('-')[0]
+        self._perp_pair_key = f"{self.perp_market}:{self.perp_trading_pair}"
 
         # 对冲配置
         self.hedge_ratio = Decimal(str(config.get('hedge_ratio', 1.0)))  # 100% 对冲
@@ -66,6 +69,20 @@ class HedgeStrategy(StrategyBase):
         self._last_hedge_time = 0
         self._entry_price = Decimal(0)
 
+        # 状态中的静态配置字段只序列化一次
+        self._status_static = {
+            "strategy": "hedge",
+            "target_asset": self.target_asset,
+            "spot_market": self.spot_market,
+            "perp_market": self.perp_market,
+            "spot_trading_pair": self.spot_trading_pair,
+            "perp_trading_pair": self.perp_trading_pair,
+            "hedge_ratio": str(self.hedge_ratio),
+            "hedge_threshold": str(self.hedge_threshold),
+            "stop_loss_pct": str(self.stop_loss_pct),
+            "take_profit_pct": str(self.take_profit_pct)
+        }
+
         self.logger.info(f"对冲策略初始化:")
         self.logger.info(f"  目标资产: {self.target_asset}")
         self.logger.info(f"  现货: {self.spot_market}:{self.spot_trading_pair}")
@@ -90,8 +107,7 @@ class HedgeStrategy(StrategyBase):
         try:
             balance = await self.get_balance_callback() if self.get_balance_callback else {}
 
-            base_asset = self.spot_trading_pair.split('-')[0]
-            self._spot_position_size = Decimal(str(balance.get(base_asset, 0)))
+            self._spot_position_size = Decimal(str(balance.get(self._base_asset, 0)))
 
             # 简化处理：永续仓位需要从交易所 API 获取
             # 这里假设已经获取
@@ -116,11 +132,10 @@ class HedgeStrategy(StrategyBase):
             target_hedge_size = self._spot_position_size * self.hedge_ratio
             current_hedge_size = abs(self._perp_position_size)
 
-            # 计算对冲偏差
-            hedge_deviation = abs(current_hedge_size - target_hedge_size) / target_hedge_size if target_hedge_size > 0 else 0
-
             # 如果偏差超过阈值，调整对冲
-            if hedge_deviation > self.rebalance_threshold:
+            # |当前 - 目标| / 目标 > 阈值  等价于  |当前 - 目标| > 阈值 * 目标，避免 Decimal 除法
+            if target_hedge_size > 0 and \
+                    abs(current_hedge_size - target_hedge_size) > self.rebalance_threshold * target_hedge_size:
                 await self._rebalance_hedge(target_hedge_size)
                 self._last_hedge_time = current_time
 
@@ -142,11 +157,9 @@ class HedgeStrategy(StrategyBase):
             # 确定对冲方向（现货多头对应永续空头）
             hedge_side = 'sell' if diff > 0 else 'buy'
 
-            perp_pair = f"{self.perp_market}:{self.perp_trading_pair}"
-
             # 下对冲订单
             order_id = await self.create_order_callback(
-                perp_pair,
+                self._perp_pair_key,
                 hedge_side,
                 float(abs(diff)),
                 0,  # 市价单
@@ -154,7 +167,7 @@ class HedgeStrategy(StrategyBase):
             )
 
             if order_id:
-                self.logger.info(f"对冲调整: {hedge_side} {abs(diff)} {self.target_asset}")
+                self.logger.info("对冲调整: %s %s %s", hedge_side, abs(diff), self.target_asset)
 
         except Exception as e:
             self.logger.error(f"重新平衡对冲失败: {e}")
@@ -170,12 +183,12 @@ class HedgeStrategy(StrategyBase):
 
             # 检查止损
             if price_change <= -self.stop_loss_pct:
-                self.logger.warning(f"触发止损: 价格变化 {price_change:.2%}")
+                self.logger.warning("触发止损: 价格变化 %.2f%%", price_change * 100)
                 await self._close_hedge()
 
             # 检查止盈
             elif price_change >= self.take_profit_pct:
-                self.logger.info(f"触发止盈: 价格变化 {price_change:.2%}")
+                self.logger.info("触发止盈: 价格变化 %.2f%%", price_change * 100)
                 await self._close_hedge()
 
         except Exception as e:
@@ -187,11 +200,10 @@ class HedgeStrategy(StrategyBase):
             if self._perp_position_size == 0:
                 return
 
-            perp_pair = f"{self.perp_market}:{self.perp_trading_pair}"
             close_side = 'buy' if self._perp_position_size < 0 else 'sell'
 
             order_id = await self.create_order_callback(
-                perp_pair,
+                self._perp_pair_key,
                 close_side,
                 float(abs(self._perp_position_size)),
                 0,
@@ -199,7 +211,7 @@ class HedgeStrategy(StrategyBase):
             )
 
             if order_id:
-                self.logger.info(f"对冲平仓: {close_side} {abs(self._perp_position_size)}")
+                self.logger.info("对冲平仓: %s %s", close_side, abs(self._perp_position_size))
                 self._perp_position_size = Decimal(0)
 
         except Exception as e:
@@ -222,16 +234,7 @@ class HedgeStrategy(StrategyBase):
     def get_status(self) -> Dict:
         """获取策略状态"""
         return {
-            "strategy": "hedge",
-            "target_asset": self.target_asset,
-            "spot_market": self.spot_market,
-            "perp_market": self.perp_market,
-            "spot_trading_pair": self.spot_trading_pair,
-            "perp_trading_pair": self.perp_trading_pair,
-            "hedge_ratio": str(self.hedge_ratio),
-            "hedge_threshold": str(self.hedge_threshold),
-            "stop_loss_pct": str(self.stop_loss_pct),
-            "take_profit_pct": str(self.take_profit_pct),
+            **self._status_static,
             "spot_position_size": str(self._spot_position_size),
             "perp_position_size": str(self._perp_position_size),
             "is_running": self.is_running
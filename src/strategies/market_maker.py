@@ -28,11 +28,15 @@ class MarketMakerStrategy(StrategyBase):
         self.bid_spread = config.get("bid_spread", 0.001)
         self.ask_spread = config.get("ask_spread", 0.001)
         self.order_refresh_time = config.get("order_refresh_time", 30)
+        self.auto_rebalance = config.get("auto_rebalance", True)
+        self.inventory_target = config.get("inventory_target_base_pct", 0.5)
 
         # 当前价格和订单簿
         self.current_price = 0.0
         self.best_bid = 0.0
         self.best_ask = 0.0
+        # 中间价，仅在买一/卖一变化时更新
+        self._mid_price = 0.0
 
         # 策略状态
         self.last_order_refresh = 0
@@ -80,29 +84,25 @@ class MarketMakerStrategy(StrategyBase):
     async def _refresh_orders(self):
         """刷新挂单"""
         try:
-            # 取消现有订单
-            if self.bid_order_id:
-                await self._cancel_order(self.bid_order_id)
-            if self.ask_order_id:
-                await self._cancel_order(self.ask_order_id)
+            # 并发取消现有订单
+            cancel_ids = [order_id for order_id in (self.bid_order_id, self.ask_order_id)
+                          if order_id]
+            if cancel_ids:
+                await asyncio.gather(*(self._cancel_order(order_id)
+                                       for order_id in cancel_ids))
 
             # 计算新的挂单价格
             if self.current_price > 0:
-                mid_price = (self.best_bid + self.best_ask) / 2
+                mid_price = self._mid_price
 
                 # 考虑仓位平衡调整价格
-                position_sizes = self.position_manager.get_position_size(
+                base_asset_size = self.position_manager.get_net_position_size(
                     self.trading_pair
                 )
-                base_asset_size = position_sizes.get("long", 0.0) - \
-                                position_sizes.get("short", 0.0)
 
                 # 仓位不平衡时调整价格
                 price_adjustment = 0
-                if self.config.get("auto_rebalance", True):
-                    inventory_target = self.config.get(
-                        "inventory_target_base_pct", 0.5
-                    )
+                if self.auto_rebalance:
                     # 简化的库存偏差调整
                     if abs(base_asset_size) > 0:
                         price_adjustment = -0.0005 * (1 if base_asset_size > 0 else -1)
@@ -110,24 +110,25 @@ class MarketMakerStrategy(StrategyBase):
                 bid_price = mid_price * (1 - self.bid_spread + price_adjustment)
                 ask_price = mid_price * (1 + self.ask_spread + price_adjustment)
 
-                # 创建新订单
-                self.bid_order_id = await self._create_order(
-                    symbol=self.trading_pair,
-                    side="buy",
-                    size=self.order_amount,
-                    price=bid_price
-                )
-
-                self.ask_order_id = await self._create_order(
-                    symbol=self.trading_pair,
-                    side="sell",
-                    size=self.order_amount,
-                    price=ask_price
+                # 并发创建买卖单，缩短无挂单窗口
+                self.bid_order_id, self.ask_order_id = await asyncio.gather(
+                    self._create_order(
+                        symbol=self.trading_pair,
+                        side="buy",
+                        size=self.order_amount,
+                        price=bid_price
+                    ),
+                    self._create_order(
+                        symbol=self.trading_pair,
+                        side="sell",
+                        size=self.order_amount,
+                        price=ask_price
+                    )
                 )
 
                 if self.bid_order_id or self.ask_order_id:
                     self.total_orders += 1
-                    self.logger.info(f"Orders refreshed: bid@{bid_price} ask@{ask_price}")
+                    self.logger.info("Orders refreshed: bid@%s ask@%s", bid_price, ask_price)
 
         except Exception as e:
             self.logger.error(f"Error refreshing orders: {e}", exc_info=True)
@@ -147,7 +148,7 @@ class MarketMakerStrategy(StrategyBase):
             )
 
             if stop_triggered:
-                self.logger.warning(f"Stop loss triggered for {position.symbol}")
+                self.logger.warning("Stop loss triggered for %s", position.symbol)
                 # 平仓
                 close_side = "sell" if position.side == PositionSide.LONG else "buy"
                 await self._create_order(
@@ -165,7 +166,7 @@ class MarketMakerStrategy(StrategyBase):
             )
 
             if tp_triggered:
-                self.logger.info(f"Take profit triggered for {position.symbol}")
+                self.logger.info("Take profit triggered for %s", position.symbol)
                 # 平仓
                 close_side = "sell" if position.side == PositionSide.LONG else "buy"
                 await self._create_order(
@@ -175,11 +176,17 @@ class MarketMakerStrategy(StrategyBase):
                     price=self.current_price
                 )
 
+    def _update_quote(self, best_bid: float, best_ask: float):
+        """更新买一/卖一，仅在报价变化时重算中间价"""
+        if best_bid != self.best_bid or best_ask != self.best_ask:
+            self.best_bid = best_bid
+            self.best_ask = best_ask
+            self._mid_price = (best_bid + best_ask) / 2
+
     async def on_tick(self, tick: Dict):
         """价格数据更新"""
         self.current_price = tick.get("last", 0.0)
-        self.best_bid = tick.get("bid", 0.0)
-        self.best_ask = tick.get("ask", 0.0)
+        self._update_quote(tick.get("bid", 0.0), tick.get("ask", 0.0))
 
         # 更新仓位未实现盈亏
         self.position_manager.update_unrealized_pnl(
@@ -190,12 +197,11 @@ class MarketMakerStrategy(StrategyBase):
     async def on_order_book(self, order_book: Dict):
         """订单簿更新"""
         if order_book.get("bids") and order_book.get("asks"):
-            self.best_bid = order_book["bids"][0][0] if order_book["bids"] else 0.0
-            self.best_ask = order_book["asks"][0][0] if order_book["asks"] else 0.0
+            self._update_quote(order_book["bids"][0][0], order_book["asks"][0][0])
 
             # 更新当前价格
             if self.current_price == 0:
-                self.current_price = (self.best_bid + self.best_ask) / 2
+                self.current_price = self._mid_price
 
     def get_performance(self) -> Dict:
         """获取策略表现"""
@@ -5,7 +5,7 @@
 import asyncio
 import logging
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -14,14 +14,14 @@ from ..core.position import PositionSide
 from ..core.event_bus import EventBus
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceSize:
-    """价格和数量"""
-    price: Decimal
-    size: Decimal
+    """价格和数量（float，下单时再转换精度）"""
+    price: float
+    size: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Proposal:
     """订单提案"""
     buy: PriceSize
@@ -74,9 +74,17 @@ class PerpetualMarketMakingStrategy(StrategyBase):
         self.order_level_spread = Decimal(str(config.get('order_level_spread', 0.0005)))
         self.order_level_amount = Decimal(str(config.get('order_level_amount', 0.001)))
 
+        # 预先计算价差系数和各级价格系数、数量（float，第 0 级系数为 1）
+        self._bid_spread_factor = 1.0 - float(self.bid_spread) / 100
+        self._ask_spread_factor = 1.0 + float(self.ask_spread) / 100
+        level_range = range(max(self.order_levels, 1))
+        self._bid_level_factors = [1.0 - float(self.order_level_spread) * level / 100 for level in level_range]
+        self._ask_level_factors = [1.0 + float(self.order_level_spread) * level / 100 for level in level_range]
+        self._level_sizes = [float(self.order_amount + self.order_level_amount * level) for level in level_range]
+
         # 价格区间
-        self.price_ceiling = Decimal(str(config.get('price_ceiling', -1))) if config.get('price_ceiling') else None
-        self.price_floor = Decimal(str(config.get('price_floor', -1))) if config.get('price_floor') else None
+        self.price_ceiling = float(config['price_ceiling']) if config.get('price_ceiling') else None
+        self.price_floor = float(config['price_floor']) if config.get('price_floor') else None
 
         # 订单优化
         self.order_optimization_enabled = config.get('order_optimization_enabled', False)
@@ -92,6 +100,26 @@ class PerpetualMarketMakingStrategy(StrategyBase):
         self._last_stop_loss_time = 0
         self._buy_levels = self.order_levels
         self._sell_levels = self.order_levels
+        # 上次挂单的一档买卖价（用于刷新容差判断）
+        self._last_bid_price: Optional[float] = None
+        self._last_ask_price: Optional[float] = None
+        # 本轮挂出的报价订单 ID（成交时据此使容差基准失效）
+        self._quote_order_ids: Set[str] = set()
+
+        # 状态中的静态配置字段只序列化一次
+        self._status_static = {
+            "strategy": "perpetual_market_making",
+            "trading_pair": self.trading_pair,
+            "leverage": self.leverage,
+            "position_mode": self.position_mode,
+            "order_amount": str(self.order_amount),
+            "bid_spread": str(self.bid_spread),
+            "ask_spread": str(self.ask_spread),
+            "long_profit_taking_spread": str(self.long_profit_taking_spread),
+            "short_profit_taking_spread": str(self.short_profit_taking_spread),
+            "stop_loss_spread": str(self.stop_loss_spread),
+            "order_levels": self.order_levels
+        }
 
         self.logger.info(f"永续合约做市策略初始化: {self.trading_pair}, 杠杆: {self.leverage}x")
 
@@ -113,13 +141,11 @@ class PerpetualMarketMakingStrategy(StrategyBase):
         await super().on_order_book(order_book)
         # 可以基于订单簿优化订单
 
-    def _calculate_order_prices(self, mid_price: Decimal, ticker: Dict) -> List[Proposal]:
+    def _calculate_order_prices(self, mid_price: float, ticker: Dict) -> List[Proposal]:
         """计算订单价格"""
-        proposals = []
-
         # 计算买单价
-        bid_price = mid_price * (Decimal(1) - self.bid_spread / Decimal(100))
-        ask_price = mid_price * (Decimal(1) + self.ask_spread / Decimal(100))
+        bid_price = mid_price * self._bid_spread_factor
+        ask_price = mid_price * self._ask_spread_factor
 
         # 应用价格区间
         if self.price_ceiling is not None:
@@ -127,26 +153,16 @@ class PerpetualMarketMakingStrategy(StrategyBase):
         if self.price_floor is not None:
             bid_price = max(bid_price, self.price_floor)
 
-        # 创建提案
-        proposals.append(Proposal(
-            buy=PriceSize(price=bid_price, size=self.order_amount),
-            sell=PriceSize(price=ask_price, size=self.order_amount)
-        ))
-
-        # 多级订单
-        if self.order_levels > 1:
-            for level in range(1, self.order_levels):
-                level_bid_price = bid_price * (Decimal(1) - self.order_level_spread * level / Decimal(100))
-                level_ask_price = ask_price * (Decimal(1) + self.order_level_spread * level / Decimal(100))
-
-                level_size = self.order_amount + (self.order_level_amount * level)
-
-                proposals.append(Proposal(
-                    buy=PriceSize(price=level_bid_price, size=level_size),
-                    sell=PriceSize(price=level_ask_price, size=level_size)
-                ))
-
-        return proposals
+        # 创建提案（含多级订单）
+        return [
+            Proposal(
+                buy=PriceSize(price=bid_price * bid_factor, size=level_size),
+                sell=PriceSize(price=ask_price * ask_factor, size=level_size)
+            )
+            for bid_factor, ask_factor, level_size in zip(
+                self._bid_level_factors, self._ask_level_factors, self._level_sizes
+            )
+        ]
 
     async def _refresh_orders(self, ticker: Dict):
         """刷新订单"""
@@ -158,92 +174,150 @@ class PerpetualMarketMakingStrategy(StrategyBase):
             # 检查最小价差
             current_spread = (ticker.get('ask', 0) - ticker.get('bid', 0)) / ticker.get('last', 1)
             if current_spread < self.minimum_spread:
-                self.logger.debug(f"当前价差 {current_spread} 小于最小价差 {self.minimum_spread}，跳过")
+                self.logger.debug("当前价差 %s 小于最小价差 %s，跳过", current_spread, self.minimum_spread)
                 return
 
-            proposals = self._calculate_order_prices(mid_price, ticker)
+            proposals = self._calculate_order_prices(float(mid_price), ticker)
+
+            # 新报价仍在容差范围内，保留现有挂单
+            if self._is_within_refresh_tolerance(proposals[0]):
+                self.logger.debug("报价变动未超过刷新容差，跳过刷新")
+                self._last_order_refresh_time = datetime.now().timestamp()
+                return
 
             # 取消现有订单
             await self._cancel_all_orders()
+            self._quote_order_ids.clear()
 
             # 提交新订单
+            placed = True
             for proposal in proposals:
-                await self._place_orders(proposal)
-
+                placed = await self._place_orders(proposal) and placed
+
+            # 仅在全部挂单成功时记录报价；否则清空，下次刷新不走容差跳过
+            if placed:
+                self._last_bid_price = proposals[0].buy.price
+                self._last_ask_price = proposals[0].sell.price
+            else:
+                self._last_bid_price = None
+                self._last_ask_price = None
             self._last_order_refresh_time = datetime.now().timestamp()
 
         except Exception as e:
             self.logger.error(f"刷新订单失败: {e}")
 
-    async def _place_orders(self, proposal: Proposal):
-        """下订单"""
+    async def _on_order_filled(self, data: Dict):
+        """订单成交回调：本策略的报价成交后清空容差基准，下次刷新重新挂出成交一侧"""
+        await super()._on_order_filled(data)
+
+        order_id = data.get('order_id')
+        if order_id in self._quote_order_ids:
+            self._quote_order_ids.discard(order_id)
+            self._last_fill_time = datetime.now().timestamp()
+            self._last_bid_price = None
+            self._last_ask_price = None
+
+    def _is_within_refresh_tolerance(self, proposal: Proposal) -> bool:
+        """判断新报价相对上次挂单的变动是否都在 order_refresh_tolerance_pct（百分比）内"""
+        if self.order_refresh_tolerance_pct < 0:
+            return False
+        if not self._last_bid_price or not self._last_ask_price:
+            return False
+
+        bid_change = abs(proposal.buy.price - self._last_bid_price) / self._last_bid_price * 100.0
+        ask_change = abs(proposal.sell.price - self._last_ask_price) / self._last_ask_price * 100.0
+        return bid_change <= self.order_refresh_tolerance_pct and \
+            ask_change <= self.order_refresh_tolerance_pct
+
+    async def _place_orders(self, proposal: Proposal) -> bool:
+        """
+        下订单
+
+        Returns:
+            买卖单是否都下单成功
+        """
+        buy_order_id = sell_order_id = None
         try:
             # 买单
             if await self.risk_manager.can_create_order(proposal.buy.size, proposal.buy.price):
                 buy_order_id = await self.create_order_callback(
-                    self.trading_pair, 'buy', float(proposal.buy.size), float(proposal.buy.price), 'limit'
+                    self.trading_pair, 'buy', proposal.buy.size, proposal.buy.price, 'limit'
                 )
                 if buy_order_id:
-                    self.logger.info(f"买单下单成功: {proposal.buy.price} x {proposal.buy.size}")
+                    self._quote_order_ids.add(buy_order_id)
+                    self.logger.info("买单下单成功: %s x %s", proposal.buy.price, proposal.buy.size)
 
             # 卖单
             if await self.risk_manager.can_create_order(proposal.sell.size, proposal.sell.price):
                 sell_order_id = await self.create_order_callback(
-                    self.trading_pair, 'sell', float(proposal.sell.size), float(proposal.sell.price), 'limit'
+                    self.trading_pair, 'sell', proposal.sell.size, proposal.sell.price, 'limit'
                 )
                 if sell_order_id:
-                    self.logger.info(f"卖单下单成功: {proposal.sell.price} x {proposal.sell.size}")
+                    self._quote_order_ids.add(sell_order_id)
+                    self.logger.info("卖单下单成功: %s x %s", proposal.sell.price, proposal.sell.size)
 
         except Exception as e:
             self.logger.error(f"下单失败: {e}")
 
+        return bool(buy_order_id and sell_order_id)
+
     async def _cancel_all_orders(self):
         """取消所有订单"""
         try:
             cancelled = await self.cancel_all_orders_callback()
             if cancelled > 0:
-                self.logger.info(f"取消了 {cancelled} 个订单")
+                self.logger.info("取消了 %s 个订单", cancelled)
         except Exception as e:
             self.logger.error(f"取消订单失败: {e}")
 
     async def _check_take_profit_stop_loss(self, ticker: Dict):
         """检查止盈止损"""
         try:
+            # 仓位直接从 position_manager 读取（字典查找），不做缓存，避免止盈止损基于过期仓位
+            long_position = self.position_manager.get_position(self.trading_pair, PositionSide.LONG)
+            short_position = self.position_manager.get_position(self.trading_pair, PositionSide.SHORT)
+            if long_position is None and short_position is None:
+                return
+
             current_price = ticker.get('last', 0)
             if current_price == 0:
                 return
 
+            # 先同步判断多空两侧是否触发，再并发平仓
+            close_coros = []
+
             # 检查多头仓位
-            long_position = self.position_manager.get_position(self.trading_pair, PositionSide.LONG)
             if long_position and long_position.size > 0:
                 entry_price = long_position.entry_price
                 pnl_pct = (current_price - entry_price) / entry_price
 
                 # 止盈
                 if pnl_pct >= self.long_profit_taking_spread:
-                    self.logger.info(f"多头止盈: 入场 {entry_price}, 当前 {current_price}, 盈利 {pnl_pct:.2%}")
-                    await self._close_position(PositionSide.LONG, 'sell')
+                    self.logger.info("多头止盈: 入场 %s, 当前 %s, 盈利 %.2f%%", entry_price, current_price, pnl_pct * 100)
+                    close_coros.append(self._close_position(PositionSide.LONG, 'sell'))
 
                 # 止损
                 elif pnl_pct <= -self.stop_loss_spread:
-                    self.logger.info(f"多头止损: 入场 {entry_price}, 当前 {current_price}, 亏损 {pnl_pct:.2%}")
-                    await self._close_position(PositionSide.LONG, 'sell')
+                    self.logger.info("多头止损: 入场 %s, 当前 %s, 亏损 %.2f%%", entry_price, current_price, pnl_pct * 100)
+                    close_coros.append(self._close_position(PositionSide.LONG, 'sell'))
 
             # 检查空头仓位
-            short_position = self.position_manager.get_position(self.trading_pair, PositionSide.SHORT)
             if short_position and short_position.size > 0:
                 entry_price = short_position.entry_price
                 pnl_pct = (entry_price - current_price) / entry_price
 
                 # 止盈
                 if pnl_pct >= self.short_profit_taking_spread:
-                    self.logger.info(f"空头止盈: 入场 {entry_price}, 当前 {current_price}, 盈利 {pnl_pct:.2%}")
-                    await self._close_position(PositionSide.SHORT, 'buy')
+                    self.logger.info("空头止盈: 入场 %s, 当前 %s, 盈利 %.2f%%", entry_price, current_price, pnl_pct * 100)
+                    close_coros.append(self._close_position(PositionSide.SHORT, 'buy'))
 
                 # 止损
                 elif pnl_pct <= -self.stop_loss_spread:
-                    self.logger.info(f"空头止损: 入场 {entry_price}, 当前 {current_price}, 亏损 {pnl_pct:.2%}")
-                    await self._close_position(PositionSide.SHORT, 'buy')
+                    self.logger.info("空头止损: 入场 %s, 当前 %s, 亏损 %.2f%%", entry_price, current_price, pnl_pct * 100)
+                    close_coros.append(self._close_position(PositionSide.SHORT, 'buy'))
+
+            if close_coros:
+                await asyncio.gather(*close_coros)
 
         except Exception as e:
             self.logger.error(f"检查止盈止损失败: {e}")
@@ -261,7 +335,7 @@ class PerpetualMarketMakingStrategy(StrategyBase):
                     'market'
                 )
                 if order_id:
-                    self.logger.info(f"平仓订单已提交: {side.value} {position.size}")
+                    self.logger.info("平仓订单已提交: %s %s", side.value, position.size)
         except Exception as e:
             self.logger.error(f"平仓失败: {e}")
 
@@ -276,16 +350,6 @@ class PerpetualMarketMakingStrategy(StrategyBase):
     def get_status(self) -> Dict:
         """获取策略状态"""
         return {
-            "strategy": "perpetual_market_making",
-            "trading_pair": self.trading_pair,
-            "leverage": self.leverage,
-            "position_mode": self.position_mode,
-            "order_amount": str(self.order_amount),
-            "bid_spread": str(self.bid_spread),
-            "ask_spread": str(self.ask_spread),
-            "long_profit_taking_spread": str(self.long_profit_taking_spread),
-            "short_profit_taking_spread": str(self.short_profit_taking_spread),
-            "stop_loss_spread": str(self.stop_loss_spread),
-            "order_levels": self.order_levels,
+            **self._status_static,
             "is_running": self.is_running
         }
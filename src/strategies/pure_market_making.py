@@ -3,22 +3,70 @@
 基于 Hummingbot 的 pure_market_making 策略
 """
 import asyncio
+import functools
 import logging
-from decimal import Decimal
-from typing import Dict, List, Optional
-from datetime import datetime
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import time
+from dataclasses import dataclass, fields
+
+import numpy as np
 
 from ..core.strategy import StrategyBase
 from ..core.position import PositionSide
 from ..core.event_bus import EventBus
+from ._kernels import calc_inventory_skew
+
+# 撤单失败的订单最多重试次数（已成交的订单撤单会一直失败，超过次数后不再跟踪）
+CANCEL_RETRY_LIMIT = 5
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceSize:
-    """价格和数量"""
-    price: Decimal
-    size: Decimal
+    """价格和数量（float，下单时再转换精度）"""
+    price: float
+    size: float
+
+
+@dataclass(slots=True, frozen=True)
+class PMMConfig:
+    """纯做市策略数值配置（float，价格计算直接使用）"""
+    order_amount: float = 0.001
+    bid_spread: float = 0.001
+    ask_spread: float = 0.001
+    minimum_spread: float = 0.0005
+    # 中间价量化步长（通常取交易所价格精度），0 表示不量化
+    price_tick_size: float = 0
+    order_refresh_tolerance_pct: float = -1
+    # 价格区间（未配置为 None）
+    price_ceiling: Optional[float] = None
+    price_floor: Optional[float] = None
+    # 动态价格带
+    price_ceiling_pct: float = 0.1
+    price_floor_pct: float = 0.1
+    # 库存偏差管理
+    inventory_target_base_pct: float = 0.5
+    inventory_range_multiplier: float = 0.1
+    inventory_price: float = 0
+    # 多级订单
+    order_level_spread: float = 0.0005
+    order_level_amount: float = 0.001
+    # 挂单模式
+    hanging_orders_cancel_pct: float = 0.1
+    # 订单优化
+    ask_order_optimization_depth: float = 1
+    bid_order_optimization_depth: float = 1
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> "PMMConfig":
+        """从策略配置字典构建"""
+        values = {}
+        for field in fields(cls):
+            value = config.get(field.name, field.default)
+            if field.name in ('price_ceiling', 'price_floor'):
+                values[field.name] = float(value) if value else None
+            else:
+                values[field.name] = float(value)
+        return cls(**values)
 
 
 class PureMarketMakingStrategy(StrategyBase):
@@ -44,25 +92,18 @@ class PureMarketMakingStrategy(StrategyBase):
 
         # 策略配置
         self.trading_pair = config.get('trading_pair', 'BTC-USDT')
+        self._base_asset, self._quote_asset = self.trading_pair.split('-')[:2]
+
+        # 数值配置（float），一次性加载
+        self.cfg = PMMConfig.from_dict(config)
 
         # 订单配置
-        self.order_amount = Decimal(str(config.get('order_amount', 0.001)))
-        self.bid_spread = Decimal(str(config.get('bid_spread', 0.001)))
-        self.ask_spread = Decimal(str(config.get('ask_spread', 0.001)))
-        self.minimum_spread = Decimal(str(config.get('minimum_spread', 0.0005)))
         self.order_refresh_time = config.get('order_refresh_time', 30)
         self.max_order_age = config.get('max_order_age', 1800)
-        self.order_refresh_tolerance_pct = Decimal(str(config.get('order_refresh_tolerance_pct', -1)))
         self.filled_order_delay = config.get('filled_order_delay', 60)
 
-        # 价格区间
-        self.price_ceiling = Decimal(str(config.get('price_ceiling', -1))) if config.get('price_ceiling') else None
-        self.price_floor = Decimal(str(config.get('price_floor', -1))) if config.get('price_floor') else None
-
         # 动态价格带
         self.moving_price_band_enabled = config.get('moving_price_band_enabled', False)
-        self.price_ceiling_pct = Decimal(str(config.get('price_ceiling_pct', 0.1)))
-        self.price_floor_pct = Decimal(str(config.get('price_floor_pct', 0.1)))
         self.price_band_refresh_time = config.get('price_band_refresh_time', 300)
 
         # Ping-Pong 模式
@@ -71,23 +112,29 @@ class PureMarketMakingStrategy(StrategyBase):
 
         # 库存偏差管理
         self.inventory_skew_enabled = config.get('inventory_skew_enabled', False)
-        self.inventory_target_base_pct = Decimal(str(config.get('inventory_target_base_pct', 0.5)))
-        self.inventory_range_multiplier = Decimal(str(config.get('inventory_range_multiplier', 0.1)))
-        self.inventory_price = Decimal(str(config.get('inventory_price', 0)))
 
         # 多级订单
         self.order_levels = config.get('order_levels', 1)
-        self.order_level_spread = Decimal(str(config.get('order_level_spread', 0.0005)))
-        self.order_level_amount = Decimal(str(config.get('order_level_amount', 0.001)))
+
+        # 多级订单的价格乘数和数量（float64 向量），第 0 级乘数为 1
+        levels = np.arange(max(self.order_levels, 1), dtype=np.float64)
+        level_spreads = self.cfg.order_level_spread * levels / 100.0
+        self._bid_level_multipliers = 1.0 - level_spreads
+        self._ask_level_multipliers = 1.0 + level_spreads
+        self._level_sizes = (self.cfg.order_amount + self.cfg.order_level_amount * levels).tolist()
+
+        # 各级价格缓存，键为（量化后的中间价, 库存调整, 价格区间）；配置不可变，无需失效。
+        # 仅在配置 price_tick_size 时启用：未量化的 float 中间价几乎不会重复，缓存只会增加开销
+        if self.cfg.price_tick_size > 0:
+            self._level_prices = functools.lru_cache(maxsize=128)(self._calculate_level_prices)
+        else:
+            self._level_prices = self._calculate_level_prices
 
         # 挂单模式
         self.hanging_orders_enabled = config.get('hanging_orders_enabled', False)
-        self.hanging_orders_cancel_pct = Decimal(str(config.get('hanging_orders_cancel_pct', 0.1)))
 
         # 订单优化
         self.order_optimization_enabled = config.get('order_optimization_enabled', False)
-        self.ask_order_optimization_depth = Decimal(str(config.get('ask_order_optimization_depth', 1)))
-        self.bid_order_optimization_depth = Decimal(str(config.get('bid_order_optimization_depth', 1)))
 
         # 价格源
         self.price_type = config.get('price_type', 'mid_price')
@@ -98,6 +145,16 @@ class PureMarketMakingStrategy(StrategyBase):
         self._last_price_band_refresh_time = 0
         self._moving_ceiling = None
         self._moving_floor = None
+        # 余额缓存（库存偏差计算用）
+        self._cached_balance: Dict = {}
+        self._cached_balance_ts = 0.0
+        self._balance_cache_ttl = 1.0
+        # 本策略当前挂出的报价订单 ID（刷新时按 ID 撤销）
+        self._quote_order_ids: List[str] = []
+        # 撤单失败、可能仍在交易所挂着的订单：order_id -> 已失败次数，下次刷新时重试
+        self._pending_cancel_ids: Dict[str, int] = {}
+        # 上次挂单时的中间价（刷新容忍度判断用）
+        self._last_mid_price = 0.0
 
         self.logger.info(f"纯做市策略初始化: {self.trading_pair}")
 
@@ -105,11 +162,12 @@ class PureMarketMakingStrategy(StrategyBase):
         """价格更新回调"""
         await super().on_tick(ticker)
 
-        current_time = datetime.now().timestamp()
+        # 内部计时统一使用单调时钟，避免每个 tick 构造 datetime 对象
+        current_time = time.monotonic()
 
         # 更新动态价格带
         if self.moving_price_band_enabled:
-            await self._update_moving_price_band(ticker, current_time)
+            self._update_moving_price_band(ticker, current_time)
 
         # 检查订单刷新
         if current_time - self._last_order_refresh_time > self.order_refresh_time:
@@ -124,185 +182,260 @@ class PureMarketMakingStrategy(StrategyBase):
         if current_price == 0:
             return
 
-        self._moving_ceiling = current_price * (Decimal(1) + self.price_ceiling_pct)
-        self._moving_floor = current_price * (Decimal(1) - self.price_floor_pct)
+        current_price = float(current_price)
+        self._moving_ceiling = current_price * (1.0 + self.cfg.price_ceiling_pct)
+        self._moving_floor = current_price * (1.0 - self.cfg.price_floor_pct)
         self._last_price_band_refresh_time = current_time
 
-        self.logger.debug(f"动态价格带更新: [{self._moving_floor}, {self._moving_ceiling}]")
+        self.logger.debug("动态价格带更新: [%s, %s]", self._moving_floor, self._moving_ceiling)
 
-    def _get_effective_price_ceiling(self) -> Optional[Decimal]:
+    def _get_effective_price_ceiling(self) -> Optional[float]:
         """获取有效的价格上限"""
         if self._moving_ceiling is not None:
             return self._moving_ceiling
-        return self.price_ceiling
+        return self.cfg.price_ceiling
 
-    def _get_effective_price_floor(self) -> Optional[Decimal]:
+    def _get_effective_price_floor(self) -> Optional[float]:
         """获取有效的价格下限"""
         if self._moving_floor is not None:
             return self._moving_floor
-        return self.price_floor
+        return self.cfg.price_floor
 
-    def _calculate_order_prices(self, mid_price: Decimal, ticker: Dict) -> List[Dict]:
+    def _calculate_level_prices(
+        self,
+        mid_price: float,
+        bid_adjustment: float,
+        ask_adjustment: float,
+        price_ceiling: Optional[float],
+        price_floor: Optional[float]
+    ) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """计算各级买卖价格（float64 计算，各级价格一次向量运算得出）"""
+        # 计算买单价
+        bid_price = mid_price * (1.0 - (self.cfg.bid_spread + bid_adjustment) / 100.0)
+        ask_price = mid_price * (1.0 + (self.cfg.ask_spread + ask_adjustment) / 100.0)
+
+        # 应用价格区间
+        if price_ceiling is not None and ask_price > price_ceiling:
+            ask_price = price_ceiling
+        if price_floor is not None and bid_price < price_floor:
+            bid_price = price_floor
+
+        # 返回不可变元组，缓存结果可安全共享
+        bid_prices = tuple((bid_price * self._bid_level_multipliers).tolist())
+        ask_prices = tuple((ask_price * self._ask_level_multipliers).tolist())
+        return bid_prices, ask_prices
+
+    async def _calculate_order_prices(self, mid_price: float, ticker: Dict) -> List[Dict]:
         """计算订单价格"""
-        proposals = []
+        mid_price = float(mid_price)
+        if self.cfg.price_tick_size > 0:
+            mid_price = round(mid_price / self.cfg.price_tick_size) * self.cfg.price_tick_size
 
         # 库存偏差调整
-        bid_adjustment = Decimal(0)
-        ask_adjustment = Decimal(0)
+        bid_adjustment = 0.0
+        ask_adjustment = 0.0
 
         if self.inventory_skew_enabled:
-            bid_adjustment, ask_adjustment = self._calculate_inventory_skew_adjustment()
-
-        # 计算买单价
-        bid_price = mid_price * (Decimal(1) - (self.bid_spread + bid_adjustment) / Decimal(100))
-        ask_price = mid_price * (Decimal(1) + (self.ask_spread + ask_adjustment) / Decimal(100))
-
-        # 应用价格区间
-        price_ceiling = self._get_effective_price_ceiling()
-        price_floor = self._get_effective_price_floor()
+            bid_adjustment, ask_adjustment = await self._calculate_inventory_skew_adjustment()
 
-        if price_ceiling is not None:
-            ask_price = min(ask_price, price_ceiling)
-        if price_floor is not None:
-            bid_price = max(bid_price, price_floor)
+        bid_prices, ask_prices = self._level_prices(
+            mid_price,
+            bid_adjustment,
+            ask_adjustment,
+            self._get_effective_price_ceiling(),
+            self._get_effective_price_floor()
+        )
 
-        # Ping-Pong 模式
+        # Ping-Pong 模式只挂第一级单边订单
         if self.ping_pong_enabled:
+            order_size = self._level_sizes[0]
             if self._ping_pong_state == 'buy':
-                proposals.append({
-                    'buy': {'price': bid_price, 'size': self.order_amount},
+                return [{
+                    'buy': {'price': bid_prices[0], 'size': order_size},
                     'sell': None
-                })
-            else:
-                proposals.append({
-                    'buy': None,
-                    'sell': {'price': ask_price, 'size': self.order_amount}
-                })
-        else:
-            # 正常模式
-            proposals.append({
-                'buy': {'price': bid_price, 'size': self.order_amount},
-                'sell': {'price': ask_price, 'size': self.order_amount}
-            })
-
-        # 多级订单
-        if self.order_levels > 1 and not self.ping_pong_enabled:
-            for level in range(1, self.order_levels):
-                level_bid_price = bid_price * (Decimal(1) - self.order_level_spread * level / Decimal(100))
-                level_ask_price = ask_price * (Decimal(1) + self.order_level_spread * level / Decimal(100))
-
-                level_size = self.order_amount + (self.order_level_amount * level)
-
-                proposals.append({
-                    'buy': {'price': level_bid_price, 'size': level_size},
-                    'sell': {'price': level_ask_price, 'size': level_size}
-                })
-
-        return proposals
-
-    def _calculate_inventory_skew_adjustment(self) -> tuple:
+                }]
+            return [{
+                'buy': None,
+                'sell': {'price': ask_prices[0], 'size': order_size}
+            }]
+
+        # 正常模式（含多级订单）
+        return [
+            {
+                'buy': {'price': level_bid, 'size': level_size},
+                'sell': {'price': level_ask, 'size': level_size}
+            }
+            for level_bid, level_ask, level_size in zip(bid_prices, ask_prices, self._level_sizes)
+        ]
+
+    async def _get_cached_balance(self) -> Dict:
+        """获取余额，在 _balance_cache_ttl 秒内复用上次结果"""
+        if not self.get_balance_callback:
+            return {}
+
+        now = time.monotonic()
+        if now - self._cached_balance_ts > self._balance_cache_ttl:
+            self._cached_balance = await self.get_balance_callback()
+            self._cached_balance_ts = now
+        return self._cached_balance
+
+    async def _calculate_inventory_skew_adjustment(self) -> tuple:
         """计算库存偏差调整"""
         try:
-            balance = asyncio.create_task(self.get_balance_callback()).result() if self.get_balance_callback else {}
-            base_balance = Decimal(str(balance.get(self.trading_pair.split('-')[0], 0)))
-            quote_balance = Decimal(str(balance.get(self.trading_pair.split('-')[1], 0)))
-
-            if quote_balance == 0:
-                return Decimal(0), Decimal(0)
-
-            current_base_pct = base_balance * self.inventory_price / quote_balance
-            deviation = (current_base_pct - self.inventory_target_base_pct) / self.inventory_range_multiplier
-
-            # 调整价差
-            bid_adjustment = max(Decimal(0), deviation)  # 增加买单价（更接近中间价）
-            ask_adjustment = max(Decimal(0), -deviation)  # 减少卖单价（更接近中间价）
-
-            return bid_adjustment, ask_adjustment
+            balance = await self._get_cached_balance()
+            return calc_inventory_skew(
+                float(balance.get(self._base_asset, 0)),
+                float(balance.get(self._quote_asset, 0)),
+                self.cfg.inventory_price,
+                self.cfg.inventory_target_base_pct,
+                self.cfg.inventory_range_multiplier
+            )
 
         except Exception as e:
             self.logger.error(f"计算库存偏差调整失败: {e}")
-            return Decimal(0), Decimal(0)
+            return 0.0, 0.0
 
     async def _refresh_orders(self, ticker: Dict):
         """刷新订单"""
         try:
-            mid_price = ticker.get('last', ticker.get('bid', 0))
+            bid, ask, last = self._unpack_ticker(ticker)
+            mid_price = last or bid
             if mid_price == 0:
                 return
 
             # 检查最小价差
-            current_spread = (ticker.get('ask', 0) - ticker.get('bid', 0)) / ticker.get('last', 1)
-            if current_spread < self.minimum_spread:
-                self.logger.debug(f"当前价差 {current_spread} 小于最小价差 {self.minimum_spread}，跳过")
+            current_spread = (ask - bid) / (last or 1)
+            if current_spread < self.cfg.minimum_spread:
+                self.logger.debug("当前价差 %s 小于最小价差 %s，跳过", current_spread, self.cfg.minimum_spread)
                 return
 
-            proposals = self._calculate_order_prices(mid_price, ticker)
-
-            # 取消现有订单
-            await self._cancel_all_orders()
+            # 中间价变动未超过刷新容忍度时保留现有挂单
+            if self._is_within_refresh_tolerance(mid_price):
+                self.logger.debug("中间价变动未超过刷新容忍度，跳过刷新")
+                self._last_order_refresh_time = time.monotonic()
+                return
 
-            # 提交新订单
-            for proposal in proposals:
-                await self._place_orders(proposal)
+            proposals = await self._calculate_order_prices(mid_price, ticker)
+
+            # 撤旧单与挂新单并发进行，避免盘口出现无报价窗口
+            stale_order_ids = self._quote_order_ids + list(self._pending_cancel_ids)
+            self._quote_order_ids = []
+            if stale_order_ids:
+                failed_ids, *_ = await asyncio.gather(
+                    self._cancel_orders(stale_order_ids),
+                    *[self._place_orders(proposal) for proposal in proposals]
+                )
+                self._track_failed_cancels(failed_ids)
+            else:
+                # 未跟踪到本策略挂单（如首次刷新）时仍先全部撤单，防止新单被误撤
+                await self._cancel_all_orders()
+                await asyncio.gather(*[self._place_orders(proposal) for proposal in proposals])
 
-            self._last_order_refresh_time = datetime.now().timestamp()
+            self._last_mid_price = mid_price
+            self._last_order_refresh_time = time.monotonic()
 
         except Exception as e:
             self.logger.error(f"刷新订单失败: {e}")
 
+    def _is_within_refresh_tolerance(self, mid_price: float) -> bool:
+        """判断中间价相对上次挂单的变动是否在 order_refresh_tolerance_pct（百分比）内"""
+        tolerance = self.cfg.order_refresh_tolerance_pct
+        if tolerance < 0 or self._last_mid_price == 0 or not self._quote_order_ids:
+            return False
+        return abs(mid_price - self._last_mid_price) / self._last_mid_price * 100.0 <= tolerance
+
     async def _place_orders(self, proposal: Dict):
-        """下订单"""
-        try:
-            # 买单
-            if proposal.get('buy'):
-                if await self.risk_manager.can_create_order(proposal['buy']['size'], proposal['buy']['price']):
-                    buy_order_id = await self.create_order_callback(
-                        self.trading_pair, 'buy',
-                        float(proposal['buy']['size']),
-                        float(proposal['buy']['price']),
-                        'limit'
-                    )
-                    if buy_order_id:
-                        self.logger.info(f"买单下单成功: {proposal['buy']['price']} x {proposal['buy']['size']}")
-
-            # 卖单
-            if proposal.get('sell'):
-                if await self.risk_manager.can_create_order(proposal['sell']['size'], proposal['sell']['price']):
-                    sell_order_id = await self.create_order_callback(
-                        self.trading_pair, 'sell',
-                        float(proposal['sell']['size']),
-                        float(proposal['sell']['price']),
-                        'limit'
-                    )
-                    if sell_order_id:
-                        self.logger.info(f"卖单下单成功: {proposal['sell']['price']} x {proposal['sell']['size']}")
+        """下订单（买卖两侧并发提交）"""
+        await asyncio.gather(
+            self._place_one('buy', proposal.get('buy')),
+            self._place_one('sell', proposal.get('sell'))
+        )
+
+    async def _place_one(self, side: str, order: Optional[Dict]):
+        """风控校验后提交单侧限价单"""
+        if not order:
+            return
 
+        try:
+            if await self.risk_manager.can_create_order(order['size'], order['price']):
+                order_id = await self.create_order_callback(
+                    self.trading_pair, side,
+                    float(order['size']),
+                    float(order['price']),
+                    'limit'
+                )
+                if order_id:
+                    self._quote_order_ids.append(order_id)
+                    self.logger.info("%s下单成功: %s x %s", "买单" if side == 'buy' else "卖单",
+                                     order['price'], order['size'])
         except Exception as e:
             self.logger.error(f"下单失败: {e}")
 
+    async def _cancel_orders(self, order_ids: List[str]) -> List[str]:
+        """
+        按 ID 并发撤销指定订单
+
+        Returns:
+            撤单失败的订单 ID
+        """
+        results = await asyncio.gather(
+            *(self.cancel_order_callback(order_id) for order_id in order_ids),
+            return_exceptions=True
+        )
+        failed_ids = []
+        for order_id, result in zip(order_ids, results):
+            if isinstance(result, Exception) or result is False:
+                self.logger.error(f"撤销订单 {order_id} 失败: {result}")
+                failed_ids.append(order_id)
+        return failed_ids
+
+    def _track_failed_cancels(self, failed_ids: List[str]):
+        """撤单失败的订单继续跟踪，下次刷新时重试；连续失败 CANCEL_RETRY_LIMIT 次后放弃"""
+        pending = {}
+        for order_id in failed_ids:
+            attempts = self._pending_cancel_ids.get(order_id, 0) + 1
+            if attempts >= CANCEL_RETRY_LIMIT:
+                self.logger.error("订单 %s 撤单连续失败 %d 次，停止重试", order_id, attempts)
+                continue
+            pending[order_id] = attempts
+        self._pending_cancel_ids = pending
+
     async def _cancel_all_orders(self):
         """取消所有订单"""
         try:
             cancelled = await self.cancel_all_orders_callback()
             if cancelled > 0:
-                self.logger.info(f"取消了 {cancelled} 个订单")
+                self.logger.info("取消了 %s 个订单", cancelled)
         except Exception as e:
             self.logger.error(f"取消订单失败: {e}")
 
-    def on_order_filled(self, event: Dict):
-        """订单成交回调"""
-        super().on_order_filled(event)
+    async def _on_order_filled(self, data: Dict):
+        """
+        订单成交回调（事件总线 order_filled）
+
+        成交的报价不再跟踪（避免下次刷新时作为撤单失败反复重试），并清除上次挂单中间价，
+        下一次刷新跳过容忍度判断、重新挂出成交一侧的报价
+        """
+        await super()._on_order_filled(data)
+
+        order_id = data.get('order_id')
+        if order_id in self._quote_order_ids:
+            self._quote_order_ids.remove(order_id)
+        elif self._pending_cancel_ids.pop(order_id, None) is None:
+            # 不是本策略的报价订单
+            return
 
-        self._last_fill_time = datetime.now().timestamp()
+        self._last_fill_time = time.monotonic()
+        self._last_mid_price = 0.0
 
         # Ping-Pong 模式切换
         if self.ping_pong_enabled:
-            if event.get('side') == 'buy':
+            if data.get('side') == 'buy':
                 self._ping_pong_state = 'sell'
             else:
                 self._ping_pong_state = 'buy'
 
-            self.logger.info(f"Ping-Pong 模式切换到: {self._ping_pong_state}")
+            self.logger.info("Ping-Pong 模式切换到: %s", self._ping_pong_state)
 
     async def _run_loop(self):
         """策略主循环"""
@@ -323,14 +456,14 @@ class PureMarketMakingStrategy(StrategyBase):
         return {
             "strategy": "pure_market_making",
             "trading_pair": self.trading_pair,
-            "order_amount": str(self.order_amount),
-            "bid_spread": str(self.bid_spread),
-            "ask_spread": str(self.ask_spread),
+            "order_amount": str(self.cfg.order_amount),
+            "bid_spread": str(self.cfg.bid_spread),
+            "ask_spread": str(self.cfg.ask_spread),
             "order_levels": self.order_levels,
             "ping_pong_enabled": self.ping_pong_enabled,
             "ping_pong_state": self._ping_pong_state if self.ping_pong_enabled else None,
             "inventory_skew_enabled": self.inventory_skew_enabled,
-            "inventory_target_base_pct": str(self.inventory_target_base_pct),
+            "inventory_target_base_pct": str(self.cfg.inventory_target_base_pct),
             "moving_price_band_enabled": self.moving_price_band_enabled,
             "is_running": self.is_running
         }
@@ -5,33 +5,72 @@
 import asyncio
 import logging
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
-from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+import time
+from enum import IntEnum
 from dataclasses import dataclass
 
 from ..core.strategy import StrategyBase
 from ..core.position import PositionSide
 from ..core.event_bus import EventBus
+from ._kernels import ARB_NONE, ARB_BUY_SPOT_SELL_PERP, scan_arb, calc_arb_profit
 
+# 开仓腿撤单最多重试次数（撤单持续失败通常是订单已成交，超过次数后按已成交处理并市价平掉）
+CANCEL_RETRY_LIMIT = 5
 
-class StrategyState(Enum):
-    """策略状态"""
+
+class StrategyState(IntEnum):
+    """策略状态（IntEnum，每个 tick 的状态判断走整数比较）"""
     Closed = 0
     Opening = 1
     Opened = 2
     Closing = 3
 
 
-@dataclass
+@dataclass(slots=True)
+class DualTicker:
+    """现货/永续双边行情（float），每个 tick 在入口处转换一次"""
+    spot_bid: float
+    spot_ask: float
+    perp_bid: float
+    perp_ask: float
+
+    @classmethod
+    def from_dict(cls, ticker: Dict) -> "DualTicker":
+        """从行情字典构造；没有 spot/perp 子字典时两边使用同一行情"""
+        spot = ticker.get('spot', ticker)
+        perp = ticker.get('perp', ticker)
+        return cls(
+            spot_bid=float(spot.get('bid', 0)),
+            spot_ask=float(spot.get('ask', 0)),
+            perp_bid=float(perp.get('bid', 0)),
+            perp_ask=float(perp.get('ask', 0))
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class ArbProposal:
-    """套利提案"""
+    """套利提案（float，下单时再转换精度）"""
     buy_market: str  # 'spot' or 'perp'
     sell_market: str
-    buy_price: Decimal
-    sell_price: Decimal
-    order_amount: Decimal
-    expected_profit_pct: Decimal
+    buy_price: float
+    sell_price: float
+    order_amount: float
+    expected_profit_pct: float
+
+
+@dataclass(slots=True)
+class ArbLeg:
+    """套利单腿订单"""
+    market: str  # 'spot' or 'perp'
+    side: str
+    amount: float
+    order_id: Optional[str] = None
+    cancel_attempts: int = 0
+
+    def reverse(self) -> "ArbLeg":
+        """反向腿（市价平掉该腿的成交）"""
+        return ArbLeg(self.market, 'sell' if self.side == 'buy' else 'buy', self.amount)
 
 
 class SpotPerpetualArbitrageStrategy(StrategyBase):
@@ -47,6 +86,10 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
     - 支持双向套利（现货买/永续卖，或 现货卖/永续买）
     - 支持滑点缓冲
     - 支持冷却时间
+
+    成交确认依赖事件总线的 order_filled 事件（{"order_id": ...}），由交易所在订单成交时发布
+    （演示模式的 MockExchange 已发布；实盘连接器需在订单跟踪中发布）；未收到成交事件的开仓腿在超时后撤单，撤单连续失败
+    CANCEL_RETRY_LIMIT 次则视为已成交并市价平掉
     """
 
     def __init__(
@@ -63,6 +106,10 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
         self.spot_trading_pair = config.get('spot_trading_pair', 'BTC-USDT')
         self.perp_market = config.get('perp_market', 'okx')
         self.perp_trading_pair = config.get('perp_trading_pair', 'BTC-USDT-SWAP')
+        # 下单符号（市场:交易对），按 'spot' / 'perp' 查找
+        self._spot_symbol = f"{self.spot_market}:{self.spot_trading_pair}"
+        self._perp_symbol = f"{self.perp_market}:{self.perp_trading_pair}"
+        self._market_symbols = {'spot': self._spot_symbol, 'perp': self._perp_symbol}
 
         # 订单配置
         self.order_amount = Decimal(str(config.get('order_amount', 0.001)))
@@ -79,16 +126,37 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
         # 冷却时间
         self.next_arbitrage_opening_delay = config.get('next_arbitrage_opening_delay', 120)
 
+        # 开仓订单等待成交的超时时间（秒）
+        self.order_timeout = config.get('order_timeout', 5)
+
         # 策略状态
         self._strategy_state = StrategyState.Closed
         self._next_arbitrage_opening_ts = 0
-        self._opening_order_ids = []
+        # 开仓期间收到的成交订单（不论是否已注册等待，下单返回前到达的成交也会记录）
+        self._filled_order_ids: Set[str] = set()
+        # 等待成交的订单：order_id -> 成交事件
+        self._fill_events: Dict[str, asyncio.Event] = {}
+        # 未确认成交、需要撤销的开仓腿（撤单失败时保留，由主循环重试）
+        self._unfilled_legs: List[ArbLeg] = []
+        # 需要市价平掉的腿（单腿成交时的已成交腿），发送失败时保留重试
+        self._unwind_legs: List[ArbLeg] = []
+        # 开仓/平仓流程进行中，主循环不做对账
+        self._transition_in_progress = False
+        # 进行中的下单任务（调用方被取消时仍会完成并记录结果）
+        self._submit_task: Optional[asyncio.Task] = None
         self._closing_order_ids = []
         self._last_status_report_time = 0
 
         # 当前套利仓位
         self._current_arb_position = None
 
+        # 套利计算内核使用的 float 参数
+        self._order_amount_f = float(self.order_amount)
+        self._min_opening_arbitrage_pct_f = float(self.min_opening_arbitrage_pct)
+        self._min_closing_arbitrage_pct_f = float(self.min_closing_arbitrage_pct)
+        self._spot_market_slippage_buffer_f = float(self.spot_market_slippage_buffer)
+        self._perp_market_slippage_buffer_f = float(self.perp_market_slippage_buffer)
+
         self.logger.info(f"现货永续套利策略初始化:")
         self.logger.info(f"  现货: {self.spot_market}:{self.spot_trading_pair}")
         self.logger.info(f"  永续: {self.perp_market}:{self.perp_trading_pair}")
@@ -98,7 +166,8 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
         """价格更新回调"""
         await super().on_tick(ticker)
 
-        current_time = datetime.now().timestamp()
+        # 内部计时统一使用单调时钟，避免每个 tick 构造 datetime 对象
+        current_time = time.monotonic()
 
         # 定期报告状态
         if current_time - self._last_status_report_time > 30:
@@ -107,84 +176,51 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
 
         # 根据状态执行逻辑
         if self._strategy_state == StrategyState.Closed:
-            await self._check_for_arbitrage_opportunity(ticker, current_time)
+            await self._check_for_arbitrage_opportunity(DualTicker.from_dict(ticker), current_time)
         elif self._strategy_state == StrategyState.Opened:
-            await self._check_for_closing_opportunity(ticker)
-
-    def _get_spot_ticker(self, ticker: Dict) -> Dict:
-        """获取现货行情"""
-        # 如果 ticker 是 dict，需要区分现货和永续
-        # 这里简化处理，实际需要分别获取
-        return ticker.get('spot', ticker)
+            await self._check_for_closing_opportunity(DualTicker.from_dict(ticker))
 
-    def _get_perp_ticker(self, ticker: Dict) -> Dict:
-        """获取永续行情"""
-        return ticker.get('perp', ticker)
-
-    async def _check_for_arbitrage_opportunity(self, ticker: Dict, current_time: float):
+    async def _check_for_arbitrage_opportunity(self, ticker: DualTicker, current_time: float):
         """检查套利机会"""
         # 检查冷却时间
         if current_time < self._next_arbitrage_opening_ts:
             return
 
         try:
-            spot_ticker = self._get_spot_ticker(ticker)
-            perp_ticker = self._get_perp_ticker(ticker)
-
-            spot_bid = Decimal(str(spot_ticker.get('bid', 0)))
-            spot_ask = Decimal(str(spot_ticker.get('ask', 0)))
-            perp_bid = Decimal(str(perp_ticker.get('bid', 0)))
-            perp_ask = Decimal(str(perp_ticker.get('ask', 0)))
-
-            if spot_bid == 0 or spot_ask == 0 or perp_bid == 0 or perp_ask == 0:
+            code, buy_price, sell_price, profit_pct = scan_arb(
+                ticker.spot_bid,
+                ticker.spot_ask,
+                ticker.perp_bid,
+                ticker.perp_ask,
+                self._min_opening_arbitrage_pct_f,
+                self._spot_market_slippage_buffer_f,
+                self._perp_market_slippage_buffer_f
+            )
+            if code == ARB_NONE:
                 return
 
-            # 情况1: 现货买 + 永续卖（现货价格低于永续）
-            if spot_ask < perp_bid:
-                profit_pct = (perp_bid - spot_ask) / spot_ask
-                if profit_pct >= self.min_opening_arbitrage_pct:
-                    proposal = ArbProposal(
-                        buy_market='spot',
-                        sell_market='perp',
-                        buy_price=spot_ask * (Decimal(1) + self.spot_market_slippage_buffer),
-                        sell_price=perp_bid * (Decimal(1) - self.perp_market_slippage_buffer),
-                        order_amount=self.order_amount,
-                        expected_profit_pct=profit_pct
-                    )
-                    await self._open_arbitrage_position(proposal)
-                    return
-
-            # 情况2: 现货卖 + 永续买（现货价格高于永续）
-            if spot_bid > perp_ask:
-                profit_pct = (spot_bid - perp_ask) / perp_ask
-                if profit_pct >= self.min_opening_arbitrage_pct:
-                    proposal = ArbProposal(
-                        buy_market='perp',
-                        sell_market='spot',
-                        buy_price=perp_ask * (Decimal(1) + self.perp_market_slippage_buffer),
-                        sell_price=spot_bid * (Decimal(1) - self.spot_market_slippage_buffer),
-                        order_amount=self.order_amount,
-                        expected_profit_pct=profit_pct
-                    )
-                    await self._open_arbitrage_position(proposal)
-                    return
+            buy_spot = code == ARB_BUY_SPOT_SELL_PERP
+            proposal = ArbProposal(
+                buy_market='spot' if buy_spot else 'perp',
+                sell_market='perp' if buy_spot else 'spot',
+                buy_price=buy_price,
+                sell_price=sell_price,
+                order_amount=self._order_amount_f,
+                expected_profit_pct=profit_pct
+            )
+            await self._open_arbitrage_position(proposal)
 
         except Exception as e:
             self.logger.error(f"检查套利机会失败: {e}")
 
-    async def _check_for_closing_opportunity(self, ticker: Dict):
+    async def _check_for_closing_opportunity(self, ticker: DualTicker):
         """检查平仓机会"""
         if not self._current_arb_position:
             return
 
         try:
-            spot_ticker = self._get_spot_ticker(ticker)
-            perp_ticker = self._get_perp_ticker(ticker)
-
-            spot_bid = Decimal(str(spot_ticker.get('bid', 0)))
-            spot_ask = Decimal(str(spot_ticker.get('ask', 0)))
-            perp_bid = Decimal(str(perp_ticker.get('bid', 0)))
-            perp_ask = Decimal(str(perp_ticker.get('ask', 0)))
+            spot_bid, spot_ask = ticker.spot_bid, ticker.spot_ask
+            perp_bid, perp_ask = ticker.perp_bid, ticker.perp_ask
 
             if spot_bid == 0 or spot_ask == 0 or perp_bid == 0 or perp_ask == 0:
                 return
@@ -192,8 +228,9 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
             # 检查是否满足平仓条件
             profit_pct = self._calculate_current_profit(spot_bid, spot_ask, perp_bid, perp_ask)
 
-            if profit_pct <= self.min_closing_arbitrage_pct:
-                self.logger.info(f"价差缩小，平仓: 当前利润 {profit_pct:.4%} <= 目标 {self.min_closing_arbitrage_pct:.4%}")
+            if profit_pct <= self._min_closing_arbitrage_pct_f:
+                self.logger.info("价差缩小，平仓: 当前利润 %.4f%% <= 目标 %.4f%%",
+                                 profit_pct * 100, self._min_closing_arbitrage_pct_f * 100)
                 await self._close_arbitrage_position()
 
         except Exception as e:
@@ -201,66 +238,212 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
 
     def _calculate_current_profit(
         self,
-        spot_bid: Decimal,
-        spot_ask: Decimal,
-        perp_bid: Decimal,
-        perp_ask: Decimal
-    ) -> Decimal:
+        spot_bid: float,
+        spot_ask: float,
+        perp_bid: float,
+        perp_ask: float
+    ) -> float:
         """计算当前利润"""
         if not self._current_arb_position:
-            return Decimal(0)
+            return 0.0
 
-        # 根据当前仓位计算利润
-        if self._current_arb_position.buy_market == 'spot':
-            # 现货买 + 永续卖
-            current_profit = (perp_bid - spot_ask) / spot_ask
-        else:
-            # 现货卖 + 永续买
-            current_profit = (spot_bid - perp_ask) / perp_ask
-
-        return current_profit
+        # 根据当前仓位方向计算利润
+        return calc_arb_profit(
+            self._current_arb_position.buy_market == 'spot',
+            spot_bid, spot_ask, perp_bid, perp_ask
+        )
 
     async def _open_arbitrage_position(self, proposal: ArbProposal):
         """开仓"""
         self._strategy_state = StrategyState.Opening
+        self._transition_in_progress = True
+        self._filled_order_ids.clear()
         self.logger.info(f"发现套利机会: 预期利润 {proposal.expected_profit_pct:.4%}")
         self.logger.info(f"  买入 {proposal.buy_market}: {proposal.buy_price}")
         self.logger.info(f"  卖出 {proposal.sell_market}: {proposal.sell_price}")
 
         try:
-            # 买入
-            buy_order_id = await self.create_order_callback(
-                proposal.buy_market + ':' + (self.spot_trading_pair if proposal.buy_market == 'spot' else self.perp_trading_pair),
-                'buy',
-                float(proposal.order_amount),
-                float(proposal.buy_price),
-                'limit'
-            )
-            self._opening_order_ids.append(buy_order_id)
-
-            # 卖出
-            sell_order_id = await self.create_order_callback(
-                proposal.sell_market + ':' + (self.spot_trading_pair if proposal.sell_market == 'spot' else self.perp_trading_pair),
-                'sell',
-                float(proposal.order_amount),
-                float(proposal.sell_price),
-                'limit'
-            )
-            self._opening_order_ids.append(sell_order_id)
-
-            self._current_arb_position = proposal
+            # 两腿同时下单（shield：调用方被取消时下单任务仍会完成并登记订单）
+            self._submit_task = asyncio.ensure_future(self._submit_opening_orders(proposal))
+            submitted = await asyncio.shield(self._submit_task)
             self.logger.info("套利开仓订单已提交")
 
-            # 等待订单成交
-            await asyncio.sleep(5)
+            if len(submitted) == 2 and await self._wait_for_fills(submitted):
+                # 两腿均成交，进入持仓状态
+                self._unfilled_legs = []
+                self._strategy_state = StrategyState.Opened
+                return
 
-            # 假设订单都成交了（简化处理）
-            self._strategy_state = StrategyState.Opened
-            self._opening_order_ids = []
+            # 超时或单腿下单失败：撤销未成交的腿，市价平掉已成交的腿
+            await self._reconcile()
 
         except Exception as e:
             self.logger.error(f"开仓失败: {e}")
-            self._strategy_state = StrategyState.Closed
+        finally:
+            self._transition_in_progress = False
+            if self._strategy_state != StrategyState.Opened:
+                # 开仓未完成同样进入冷却，价差持续时不会每 order_timeout 秒反复下单、撤单
+                self._next_arbitrage_opening_ts = time.monotonic() + self.next_arbitrage_opening_delay
+            self._settle_if_flat()
+
+    async def _submit_opening_orders(self, proposal: ArbProposal) -> List[ArbLeg]:
+        """
+        两腿同时下限价单并登记已提交的腿；单腿下单失败时另一腿由 _reconcile 撤销或平掉
+
+        Returns:
+            下单成功的腿
+        """
+        legs = [
+            ArbLeg(proposal.buy_market, 'buy', proposal.order_amount),
+            ArbLeg(proposal.sell_market, 'sell', proposal.order_amount)
+        ]
+        prices = (proposal.buy_price, proposal.sell_price)
+        results = await asyncio.gather(
+            *(self.create_order_callback(self._market_symbols[leg.market], leg.side, leg.amount, price, 'limit')
+              for leg, price in zip(legs, prices)),
+            return_exceptions=True
+        )
+
+        submitted = []
+        for leg, result in zip(legs, results):
+            if isinstance(result, Exception) or not result:
+                self.logger.error(f"开仓下单 {leg.market} {leg.side} 失败: {result}")
+                continue
+            leg.order_id = result
+            submitted.append(leg)
+
+        if submitted:
+            # 订单已提交即记录仓位，存在敞口时不会丢失
+            self._current_arb_position = proposal
+            self._unfilled_legs = submitted
+        return submitted
+
+    async def _wait_for_fills(self, legs: List[ArbLeg]) -> bool:
+        """
+        等待各腿成交（成交即返回，最多等待 order_timeout 秒）
+
+        Returns:
+            是否全部成交
+        """
+        fill_events = []
+        for leg in legs:
+            fill_event = self._fill_events.setdefault(leg.order_id, asyncio.Event())
+            if leg.order_id in self._filled_order_ids:
+                # 下单返回前已成交
+                fill_event.set()
+            fill_events.append(fill_event)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in fill_events)),
+                timeout=self.order_timeout
+            )
+            return True
+        except asyncio.TimeoutError:
+            self.logger.warning("开仓订单未在 %s 秒内全部成交", self.order_timeout)
+            return False
+        finally:
+            for leg in legs:
+                self._fill_events.pop(leg.order_id, None)
+
+    async def _on_order_filled(self, data: Dict):
+        """订单成交回调"""
+        await super()._on_order_filled(data)
+
+        order_id = data.get("order_id")
+        if not order_id or self._strategy_state != StrategyState.Opening:
+            return
+
+        # 开仓期间记录所有成交，先于等待注册到达的成交也不会丢失
+        self._filled_order_ids.add(order_id)
+        fill_event = self._fill_events.get(order_id)
+        if fill_event:
+            fill_event.set()
+
+    async def _reconcile(self):
+        """
+        处理未对冲的敞口：撤销未成交的开仓腿，市价平掉已成交的单腿及待平仓的腿；
+        全部处理完才清空仓位记录回到空仓状态，否则保持 Opening/Closing 由主循环重试
+        """
+        filled = self._filled_order_ids
+        pending = [leg for leg in self._unfilled_legs if leg.order_id not in filled]
+        self._unwind_legs += [leg.reverse() for leg in self._unfilled_legs if leg.order_id in filled]
+
+        failed_cancels = await self._cancel_legs(pending)
+        self._unfilled_legs = []
+        for leg in pending:
+            if leg.order_id in filled:
+                # 撤单期间成交
+                self._unwind_legs.append(leg.reverse())
+            elif leg in failed_cancels:
+                leg.cancel_attempts += 1
+                if leg.cancel_attempts >= CANCEL_RETRY_LIMIT:
+                    # 撤单持续失败通常是订单已成交（未收到成交事件）：按已成交处理，市价平掉该腿
+                    self.logger.error("开仓订单 %s 撤单连续失败 %d 次，按已成交处理并平仓",
+                                      leg.order_id, leg.cancel_attempts)
+                    self._unwind_legs.append(leg.reverse())
+                else:
+                    self._unfilled_legs.append(leg)
+
+        if self._unwind_legs:
+            self._submit_task = asyncio.ensure_future(self._send_unwind_orders())
+            await asyncio.shield(self._submit_task)
+
+        if self._unfilled_legs or self._unwind_legs:
+            self.logger.warning("套利敞口未完全处理: %d 个订单待撤销, %d 条腿待平仓",
+                                len(self._unfilled_legs), len(self._unwind_legs))
+        self._settle_if_flat()
+
+    def _settle_if_flat(self):
+        """开仓/平仓过程中已无未处理的订单与敞口时，清空仓位记录回到空仓状态"""
+        if self._strategy_state not in (StrategyState.Opening, StrategyState.Closing):
+            return
+        if self._unfilled_legs or self._unwind_legs:
+            return
+        if self._submit_task is not None and not self._submit_task.done():
+            return
+
+        if self._strategy_state == StrategyState.Closing:
+            self._next_arbitrage_opening_ts = time.monotonic() + self.next_arbitrage_opening_delay
+            self.logger.info("平仓完成")
+        self._current_arb_position = None
+        self._strategy_state = StrategyState.Closed
+
+    async def _cancel_legs(self, legs: List[ArbLeg]) -> List[ArbLeg]:
+        """
+        并发撤销订单
+
+        Returns:
+            撤单失败的腿
+        """
+        if not self.cancel_order_callback or not legs:
+            return []
+
+        results = await asyncio.gather(
+            *(self.cancel_order_callback(leg.order_id) for leg in legs),
+            return_exceptions=True
+        )
+        failed = []
+        for leg, result in zip(legs, results):
+            if isinstance(result, Exception) or result is False:
+                self.logger.error(f"撤销开仓订单 {leg.order_id} 失败: {result}")
+                failed.append(leg)
+        return failed
+
+    async def _send_unwind_orders(self):
+        """并发发送 _unwind_legs 的市价单，下单失败的腿保留待重试"""
+        legs = self._unwind_legs
+        results = await asyncio.gather(
+            *(self.create_order_callback(self._market_symbols[leg.market], leg.side, leg.amount, 0, 'market')
+              for leg in legs),
+            return_exceptions=True
+        )
+        failed = []
+        for leg, result in zip(legs, results):
+            if isinstance(result, Exception) or not result:
+                self.logger.error(f"市价平仓 {leg.market} {leg.side} 失败: {result}")
+                failed.append(leg)
+        self._unwind_legs = failed
 
     async def _close_arbitrage_position(self):
         """平仓"""
@@ -268,71 +451,48 @@ class SpotPerpetualArbitrageStrategy(StrategyBase):
             return
 
         self._strategy_state = StrategyState.Closing
+        self._transition_in_progress = True
         self.logger.info("开始平仓...")
 
         try:
-            # 获取当前仓位（这里简化处理）
-            order_amount = self._current_arb_position.order_amount
-
-            # 如果是现货买 + 永续卖，现在需要现货卖 + 永续买
-            if self._current_arb_position.buy_market == 'spot':
-                # 现货卖
-                await self.create_order_callback(
-                    self.spot_market + ':' + self.spot_trading_pair,
-                    'sell',
-                    float(order_amount),
-                    0,
-                    'market'
-                )
-                # 永续买
-                await self.create_order_callback(
-                    self.perp_market + ':' + self.perp_trading_pair,
-                    'buy',
-                    float(order_amount),
-                    0,
-                    'market'
-                )
-            else:
-                # 现货买
-                await self.create_order_callback(
-                    self.spot_market + ':' + self.spot_trading_pair,
-                    'buy',
-                    float(order_amount),
-                    0,
-                    'market'
-                )
-                # 永续卖
-                await self.create_order_callback(
-                    self.perp_market + ':' + self.perp_trading_pair,
-                    'sell',
-                    float(order_amount),
-                    0,
-                    'market'
-                )
-
-            self._current_arb_position = None
-            self._strategy_state = StrategyState.Closed
-            self._next_arbitrage_opening_ts = datetime.now().timestamp() + self.next_arbitrage_opening_delay
-            self.logger.info("平仓完成")
+            # 两腿各自反向市价平仓；失败的腿保留在 _unwind_legs 中重试，已成交的腿不会重复下单
+            position = self._current_arb_position
+            self._unwind_legs = [
+                ArbLeg(position.buy_market, 'sell', position.order_amount),
+                ArbLeg(position.sell_market, 'buy', position.order_amount)
+            ]
+            await self._reconcile()
 
         except Exception as e:
             self.logger.error(f"平仓失败: {e}")
+        finally:
+            self._transition_in_progress = False
+            self._settle_if_flat()
 
     async def _report_status(self):
         """报告状态"""
+        # 未开启 INFO 日志时跳过状态字典构建和格式化
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         status = {
             "state": self._strategy_state.name,
             "arbitrage_profit": str(self._current_arb_position.expected_profit_pct) if self._current_arb_position else "0",
-            "next_arbitrage_delay": max(0, self._next_arbitrage_opening_ts - datetime.now().timestamp())
+            "next_arbitrage_delay": max(0, self._next_arbitrage_opening_ts - time.monotonic())
         }
 
-        self.logger.info(f"套利策略状态: {status}")
+        self.logger.info("套利策略状态: %s", status)
 
     async def _run_loop(self):
         """策略主循环"""
         while self.is_running:
             try:
                 await asyncio.sleep(1)
+                # 重试未处理完的开仓/平仓敞口（等待被取消的下单任务完成后再处理）
+                if (self._strategy_state in (StrategyState.Opening, StrategyState.Closing)
+                        and not self._transition_in_progress
+                        and (self._submit_task is None or self._submit_task.done())):
+                    await self._reconcile()
             except Exception as e:
                 self.logger.error(f"现货永续套利策略主循环错误: {e}")
 
@@ -2,32 +2,98 @@
 Web API 扩展
 为前端提供完整的 REST API 接口
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from typing import Dict, List, Optional, Any
 import json
 import logging
 import sys
 import asyncio
+import bisect
+import functools
+import itertools
+import random
+import time
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta
-from dataclasses import asdict
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from .json_utils import FastJSONResponse, dumps_bytes, error_response, etag_response
+from .ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
 
+# K 线周期映射（秒）
+_INTERVAL_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+    "1w": 604800
+}
+
+
+# PnL 历史保留条数；超出 PNL_HISTORY_TRIM 条后一次性删除最旧的记录（摊还 O(1)）
+PNL_HISTORY_LIMIT = 100_000
+PNL_HISTORY_TRIM = 10_000
+
+
+@functools.cache
+def _mock_base_price(symbol: str) -> float:
+    """模拟数据的基准价格"""
+    return 50000.0 if 'BTC' in symbol else 3000.0
+
+
+@dataclass(slots=True, frozen=True)
+class EquitySnapshot:
+    """账户权益快照（/api/equity 与 /api/stats/realtime 共用）"""
+    total_balance: float
+    available_balance: float
+    unrealized_pnl: float
+    equity: float
+
+
+# 余额获取失败时使用的零权益快照（不写入缓存，下一次请求重新获取）
+_ZERO_EQUITY = EquitySnapshot(total_balance=0.0, available_balance=0.0, unrealized_pnl=0.0, equity=0.0)
+
+
 class APIExtension:
     """API 扩展类 - 提供完整的 REST API 接口"""
 
     def __init__(self, app: FastAPI, bot_instance, strategy_manager=None, ws_log_handler=None):
         self.app = app
         self.bot = bot_instance
+        # 一次性解析 bot 上的组件引用，处理请求时不再逐次 hasattr 探测
+        self._exchange = getattr(bot_instance, 'exchange', None)
+        self._position_manager = getattr(bot_instance, 'position_manager', None)
+        self._exchange_name = getattr(self._exchange, 'exchange_name', 'unknown')
+        # 资金账户余额接口（演示用 MockExchange 未实现，视为资金账户为空）
+        self._get_asset_balance = getattr(self._exchange, 'get_asset_balance', None)
         self.strategy_manager = strategy_manager
         self.ws_log_handler = ws_log_handler
 
         # 数据存储（从真实交易所和数据库获取）
-        self._trade_history = []
-        self._pnl_history = []
-        self._backtest_results = {}
+        # 成交历史（有界）及按交易对的索引，按交易对查询无需全表扫描
+        self._trade_history = deque(maxlen=100_000)
+        self._trade_history_by_symbol: Dict[str, deque] = defaultdict(lambda: deque(maxlen=10_000))
+        # PnL 历史及平行的时间戳序列（按时间追加，有序）。使用 list 而非 deque：
+        # deque 的下标访问是 O(n)，list 上二分查找时间范围为 O(log n)，切片只复制命中的记录
+        self._pnl_history: List[Dict] = []
+        self._pnl_timestamps: List[float] = []
+        # 回测结果（LRU，超过上限淘汰最久未访问的结果）
+        self._backtest_results: OrderedDict = OrderedDict()
+        self._max_backtest_results = 100
+
+        # 短时 TTL 缓存（single-flight），合并面板高频轮询
+        self._ttl_cache = AsyncTTLCache(ttl=2.0)
+        # 模拟行情序列化结果缓存，按 (类型, 交易对, 数量, 周期, 秒级时间桶) 复用
+        self._mock_payload_cache = functools.lru_cache(maxsize=64)(self._build_mock_payload)
 
         # 设置所有路由
         self._setup_all_routes()
@@ -48,7 +114,7 @@ class APIExtension:
         """设置账户相关 API"""
 
         @self.app.get("/api/equity")
-        async def get_equity():
+        async def get_equity(request: Request):
             """
             获取账户权益
 
@@ -67,45 +133,27 @@ class APIExtension:
             }
             """
             try:
-                # 获取余额
-                balance_data = await self._get_balance_data()
-
-                # 计算权益
-                total_balance = sum(
-                    b.get('total', 0) for b in balance_data.values()
-                )
-                available_balance = sum(
-                    b.get('available', 0) for b in balance_data.values()
-                )
-
-                # 获取仓位计算未实现盈亏
-                unrealized_pnl = await self._get_unrealized_pnl()
+                snapshot = await self._get_equity_snapshot_or_zero()
 
                 # 模拟 PnL 数据（实际应用中应该从数据库或交易所获取）
                 realized_pnl = 0
                 today_pnl = 0
 
-                equity = total_balance + unrealized_pnl
-
-                return {
+                return etag_response(request, {
                     "account_id": "main",
-                    "exchange": getattr(self.bot.exchange, 'exchange_name', 'unknown') if hasattr(self.bot, 'exchange') else 'unknown',
-                    "equity": equity,
-                    "total_balance": total_balance,
-                    "available_balance": available_balance,
+                    "exchange": self._exchange_name,
+                    "equity": snapshot.equity,
+                    "total_balance": snapshot.total_balance,
+                    "available_balance": snapshot.available_balance,
                     "pnl": realized_pnl,
                     "today_pnl": today_pnl,
-                    "unrealized_pnl": unrealized_pnl,
+                    "unrealized_pnl": snapshot.unrealized_pnl,
                     "leverage": 1.0,
                     "margin_ratio": 0.0
-                }
+                })
             except Exception as e:
-                logger.error(f"获取权益失败: {e}")
-                import traceback
-                return {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
+                logger.exception("获取权益失败: %s", e)
+                return error_response(e, self.app.debug)
 
         @self.app.get("/api/balance")
         async def get_balance_api():
@@ -120,15 +168,16 @@ class APIExtension:
             }
             """
             try:
-                balance_data = await self._get_balance_data()
-                return balance_data
+                try:
+                    balance_data = await self._get_balance_data()
+                except Exception as e:
+                    # 交易所暂时失败：返回空余额，失败结果不缓存
+                    logger.warning("获取余额数据失败: %s", e)
+                    balance_data = {}
+                return FastJSONResponse(balance_data)
             except Exception as e:
-                logger.error(f"获取余额失败: {e}")
-                import traceback
-                return {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
+                logger.exception("获取余额失败: %s", e)
+                return error_response(e, self.app.debug)
 
     # ==================== 仓位相关 API ====================
 
@@ -159,46 +208,24 @@ class APIExtension:
             ]
             """
             try:
-                positions = []
-
-                if hasattr(self.bot, 'position_manager'):
-                    # 从 position_manager 获取仓位
-                    position_dict = self.bot.position_manager.to_dict()
-
-                    for symbol, pos_data in position_dict.items():
-                        if isinstance(pos_data, dict):
-                            positions.append({
-                                "symbol": symbol,
-                                "side": pos_data.get('side', 'long'),
-                                "size": pos_data.get('amount', 0),
-                                "entry_price": pos_data.get('entry_price', 0),
-                                "mark_price": pos_data.get('mark_price', 0),
-                                "liquidation_price": pos_data.get('liquidation_price'),
-                                "unrealized_pnl": pos_data.get('unrealized_pnl', 0),
-                                "realized_pnl": pos_data.get('realized_pnl', 0),
-                                "leverage": pos_data.get('leverage', 1.0),
-                                "margin": pos_data.get('margin', 0),
-                                "margin_ratio": pos_data.get('margin_ratio', 0)
-                            })
-
-                return positions
+                return FastJSONResponse(await self._cached("positions", self._fetch_positions_data))
             except Exception as e:
                 logger.error(f"获取仓位失败: {e}")
-                import traceback
                 return []
 
         @self.app.get("/api/positions/{symbol}")
         async def get_position(symbol: str):
             """获取指定交易对的仓位"""
             try:
-                positions = await get_positions()
-                for pos in positions:
-                    if pos['symbol'] == symbol:
-                        return pos
-                return {"error": "Position not found"}
+                pos_data = None
+                if self._position_manager is not None:
+                    pos_data = (await self._get_position_dict()).get(symbol)
+                if not isinstance(pos_data, dict):
+                    return FastJSONResponse({"error": "Position not found"})
+                return FastJSONResponse(self._format_position(symbol, pos_data))
             except Exception as e:
-                logger.error(f"获取仓位失败: {e}")
-                return {"error": str(e)}
+                logger.exception("获取仓位失败: %s", e)
+                return error_response(e, self.app.debug)
 
     # ==================== 订单相关 API ====================
 
@@ -230,9 +257,10 @@ class APIExtension:
             try:
                 orders = []
 
-                if hasattr(self.bot, 'exchange'):
+                if self._exchange is not None:
                     # 从交易所获取开放订单
-                    open_orders = await self.bot.exchange.get_open_orders()
+                    open_orders = await self._exchange.get_open_orders()
+                    now = time.time()
 
                     for order in open_orders:
                         orders.append({
@@ -245,13 +273,12 @@ class APIExtension:
                             "filled": order.get('filled', 0),
                             "remaining": order.get('remaining', order.get('amount', 0) - order.get('filled', 0)),
                             "status": order.get('status', 'open'),
-                            "timestamp": order.get('timestamp', order.get('created_at', datetime.now().timestamp()))
+                            "timestamp": order.get('timestamp', order.get('created_at', now))
                         })
 
-                return orders
+                return FastJSONResponse(orders)
             except Exception as e:
                 logger.error(f"获取活跃订单失败: {e}")
-                import traceback
                 return []
 
         @self.app.get("/api/trades/history")
@@ -278,18 +305,16 @@ class APIExtension:
             ]
             """
             try:
-                trades = []
-
-                # 从模拟历史中获取
                 if symbol:
-                    trades = [t for t in self._trade_history if t['symbol'] == symbol]
+                    source = self._trade_history_by_symbol.get(symbol, ())
                 else:
-                    trades = self._trade_history
+                    source = self._trade_history
 
-                # 限制返回数量
-                trades = trades[-limit:]
+                # 从尾部取最近 limit 条，再恢复时间顺序
+                trades = list(itertools.islice(reversed(source), limit))
+                trades.reverse()
 
-                return trades
+                return FastJSONResponse(trades)
             except Exception as e:
                 logger.error(f"获取成交历史失败: {e}")
                 return []
@@ -316,26 +341,25 @@ class APIExtension:
             }
             """
             try:
-                if hasattr(self.bot, 'exchange'):
-                    orderbook = await self.bot.exchange.get_order_book(symbol, limit)
+                if self._exchange is not None:
+                    orderbook = await self._exchange.get_order_book(symbol, limit)
 
                     # 格式化返回数据
                     bids = [[float(bid[0]), float(bid[1])] for bid in orderbook.get('bids', [])[:limit]]
                     asks = [[float(ask[0]), float(ask[1])] for ask in orderbook.get('asks', [])[:limit]]
 
-                    return {
+                    return FastJSONResponse({
                         "symbol": symbol,
                         "bids": bids,
                         "asks": asks,
-                        "timestamp": datetime.now().timestamp()
-                    }
+                        "timestamp": time.time()
+                    })
                 else:
                     # 返回模拟数据
-                    return self._get_mock_orderbook(symbol, limit)
+                    return self._mock_response("orderbook", symbol, limit)
             except Exception as e:
                 logger.error(f"获取订单簿失败: {e}")
-                import traceback
-                return self._get_mock_orderbook(symbol, limit)
+                return self._mock_response("orderbook", symbol, limit)
 
         @self.app.get("/api/ticker/{symbol}")
         async def get_ticker(symbol: str):
@@ -359,21 +383,22 @@ class APIExtension:
             }
             """
             try:
-                if hasattr(self.bot, 'exchange'):
-                    ticker = await self.bot.exchange.get_ticker(symbol)
-                    return ticker
+                if self._exchange is not None:
+                    ticker = await self._exchange.get_ticker(symbol)
+                    return FastJSONResponse(ticker)
                 else:
                     # 返回模拟数据
-                    return self._get_mock_ticker(symbol)
+                    return self._mock_response("ticker", symbol)
             except Exception as e:
                 logger.error(f"获取 Ticker 失败: {e}")
-                return self._get_mock_ticker(symbol)
+                return self._mock_response("ticker", symbol)
 
         @self.app.get("/api/klines")
         async def get_klines(
             symbol: str = Query(...),
             interval: str = Query("1h", pattern="^(1m|5m|15m|30m|1h|4h|1d|1w)$"),
-            limit: int = Query(100, ge=1, le=1000)
+            limit: int = Query(100, ge=1, le=1000),
+            stream: bool = Query(False)
         ):
             """
             获取 K 线数据
@@ -390,14 +415,20 @@ class APIExtension:
                 },
                 ...
             ]
+
+            stream=true 时以 NDJSON（application/x-ndjson）流式返回，每行一根 K 线
             """
             try:
-                if hasattr(self.bot, 'exchange'):
-                    klines = await self.bot.exchange.get_klines(symbol, interval, limit)
-                    return klines
+                if self._exchange is not None:
+                    klines = await self._exchange.get_klines(symbol, interval, limit)
+                    if stream:
+                        return self._ndjson_response(klines)
+                    return FastJSONResponse(klines)
+                elif stream:
+                    return self._ndjson_response(self._get_mock_klines(symbol, interval, limit))
                 else:
                     # 返回模拟数据
-                    return self._get_mock_klines(symbol, interval, limit)
+                    return self._mock_response("klines", symbol, limit, interval)
             except Exception as e:
                 logger.error(f"获取 K 线数据失败: {e}")
                 return []
@@ -427,22 +458,17 @@ class APIExtension:
             ]
             """
             try:
-                # 获取权益历史
-                pnl_data = []
-
-                # 如果提供了时间范围，则过滤
+                # 如果提供了时间范围，则二分定位区间
                 if start_time or end_time:
-                    filtered_data = [
-                        d for d in self._pnl_history
-                        if (not start_time or d['timestamp'] >= start_time)
-                        and (not end_time or d['timestamp'] <= end_time)
-                    ]
-                    pnl_data = filtered_data
+                    left = bisect.bisect_left(self._pnl_timestamps, start_time) if start_time else 0
+                    right = bisect.bisect_right(self._pnl_timestamps, end_time) if end_time \
+                        else len(self._pnl_timestamps)
+                    pnl_data = self._pnl_history[left:right]
                 else:
                     # 返回最近 100 条记录
                     pnl_data = self._pnl_history[-100:]
 
-                return pnl_data
+                return FastJSONResponse(pnl_data)
             except Exception as e:
                 logger.error(f"获取 PnL 历史失败: {e}")
                 return []
@@ -483,18 +509,16 @@ class APIExtension:
                 )
 
                 self._backtest_results[backtest_id] = result
+                if len(self._backtest_results) > self._max_backtest_results:
+                    self._backtest_results.popitem(last=False)
 
                 return {
                     "backtest_id": backtest_id,
                     "status": "completed"
                 }
             except Exception as e:
-                logger.error(f"运行回测失败: {e}")
-                import traceback
-                return {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
+                logger.exception("运行回测失败: %s", e)
+                return error_response(e, self.app.debug)
 
         @self.app.get("/api/backtest/{backtest_id}")
         async def get_backtest_result(backtest_id: str):
@@ -527,12 +551,13 @@ class APIExtension:
             try:
                 result = self._backtest_results.get(backtest_id)
                 if not result:
-                    return {"error": "Backtest not found"}
+                    return FastJSONResponse({"error": "Backtest not found"})
+                self._backtest_results.move_to_end(backtest_id)
 
-                return result
+                return FastJSONResponse(result)
             except Exception as e:
-                logger.error(f"获取回测结果失败: {e}")
-                return {"error": str(e)}
+                logger.exception("获取回测结果失败: %s", e)
+                return error_response(e, self.app.debug)
 
     # ==================== 系统管理 API ====================
 
@@ -540,7 +565,7 @@ class APIExtension:
         """设置系统管理相关 API"""
 
         @self.app.get("/api/stats/realtime")
-        async def get_realtime_stats():
+        async def get_realtime_stats(request: Request):
             """
             获取实时统计数据
 
@@ -571,75 +596,161 @@ class APIExtension:
                         1 for i in instances if i.get('is_running', False)
                     )
 
-                # 获取权益
-                balance_data = await self._get_balance_data()
-                unrealized_pnl = await self._get_unrealized_pnl()
-
-                total_balance = sum(
-                    b.get('total', 0) for b in balance_data.values()
-                )
-                equity = total_balance + unrealized_pnl
-
-                stats["total_equity"] = equity
-                stats["total_pnl"] = unrealized_pnl
+                # 复用与 /api/equity 相同的权益快照（余额获取失败时权益为 0，策略统计照常返回）
+                snapshot = await self._get_equity_snapshot_or_zero()
+                stats["total_equity"] = snapshot.equity
+                stats["total_pnl"] = snapshot.unrealized_pnl
 
-                return stats
+                return etag_response(request, stats)
             except Exception as e:
-                logger.error(f"获取实时统计失败: {e}")
-                import traceback
-                return {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
+                logger.exception("获取实时统计失败: %s", e)
+                return error_response(e, self.app.debug)
 
     # ==================== 辅助方法 ====================
 
+    async def _cached(self, key: str, fetch):
+        """
+        TTL 缓存包装（见 AsyncTTLCache）
+
+        Args:
+            key: 缓存键
+            fetch: 无参协程函数，缓存失效时调用
+        """
+        return await self._ttl_cache.get(key, fetch)
+
     async def _get_balance_data(self) -> Dict[str, Dict]:
-        """获取余额数据（从真实交易所）- 同时获取交易账户和资金账户"""
+        """获取余额数据（TTL 缓存）"""
+        return await self._cached("balance", self._fetch_balance_data)
+
+    async def _get_equity_snapshot(self) -> EquitySnapshot:
+        """获取账户权益快照（TTL 缓存）"""
+        return await self._cached("equity", self._compute_equity_snapshot)
+
+    async def _get_equity_snapshot_or_zero(self) -> EquitySnapshot:
+        """获取账户权益快照；余额获取失败时返回零权益（不缓存，下一次请求重试）"""
         try:
-            if hasattr(self.bot, 'exchange'):
-                exchange = self.bot.exchange
-
-                # 获取交易账户余额
-                trading_balance = await exchange.get_balance()
-
-                # 获取资金账户余额（现金账户）
-                asset_balance = await exchange.get_asset_balance()
-
-                # 合并两个账户的余额
-                combined_balance = {}
-                all_currencies = set(trading_balance.keys()) | set(asset_balance.keys())
-
-                for ccy in all_currencies:
-                    trading = trading_balance.get(ccy, {})
-                    asset = asset_balance.get(ccy, {})
-
-                    combined_balance[ccy] = {
-                        'total': (trading.get('total', 0) + asset.get('total', 0)),
-                        'available': (trading.get('available', 0) + asset.get('available', 0)),
-                        'frozen': (trading.get('frozen', 0) + asset.get('frozen', 0)),
-                        'trading': trading,  # 交易账户余额
-                        'asset': asset       # 资金账户余额
-                    }
-
-                print(f"✅ 获取双账户余额成功: {len(combined_balance)} 种货币")
-                return combined_balance
-            else:
-                logger.error("Bot 没有配置交易所实例")
-                return {}
+            return await self._get_equity_snapshot()
         except Exception as e:
-            logger.error(f"获取余额数据失败: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return {}
+            logger.warning("获取账户权益失败: %s", e)
+            return _ZERO_EQUITY
+
+    async def _compute_equity_snapshot(self) -> EquitySnapshot:
+        """并发获取余额和仓位未实现盈亏并计算权益"""
+        balance_data, unrealized_pnl = await asyncio.gather(
+            self._get_balance_data(),
+            self._get_unrealized_pnl()
+        )
+        total_balance, available_balance = self._aggregate_balance(balance_data)
+        return EquitySnapshot(
+            total_balance=total_balance,
+            available_balance=available_balance,
+            unrealized_pnl=unrealized_pnl,
+            equity=total_balance + unrealized_pnl
+        )
+
+    @staticmethod
+    def _aggregate_balance(balance_data: Dict[str, Dict]) -> tuple:
+        """单次遍历汇总 (总余额, 可用余额)"""
+        total = available = 0.0
+        for b in balance_data.values():
+            total += b.get('total', 0) or 0
+            available += b.get('available', 0) or 0
+        return total, available
 
     async def _get_unrealized_pnl(self) -> float:
+        """获取未实现盈亏（TTL 缓存）"""
+        return await self._cached("unrealized_pnl", self._fetch_unrealized_pnl)
+
+    async def _get_position_dict(self) -> Dict:
+        """获取 position_manager 仓位字典（TTL 缓存）"""
+        return await self._cached("position_dict", self._fetch_position_dict)
+
+    async def _fetch_position_dict(self) -> Dict:
+        """
+        获取 position_manager.to_dict()
+
+        在事件循环内调用：仓位字典由成交回调在事件循环中修改，工作线程遍历会与之竞争；
+        to_dict() 为 O(持仓数)，且结果有 TTL 缓存
+        """
+        return self._position_manager.to_dict()
+
+    async def _fetch_positions_data(self) -> List[Dict]:
+        """从 position_manager 构建仓位列表"""
+        positions = []
+
+        if self._position_manager is not None:
+            position_dict = await self._get_position_dict()
+
+            for symbol, pos_data in position_dict.items():
+                if isinstance(pos_data, dict):
+                    positions.append(self._format_position(symbol, pos_data))
+
+        return positions
+
+    @staticmethod
+    def _format_position(symbol: str, pos_data: Dict) -> Dict:
+        """将 position_manager 的仓位数据转换为 API 返回格式"""
+        return {
+            "symbol": symbol,
+            "side": pos_data.get('side', 'long'),
+            "size": pos_data.get('amount', 0),
+            "entry_price": pos_data.get('entry_price', 0),
+            "mark_price": pos_data.get('mark_price', 0),
+            "liquidation_price": pos_data.get('liquidation_price'),
+            "unrealized_pnl": pos_data.get('unrealized_pnl', 0),
+            "realized_pnl": pos_data.get('realized_pnl', 0),
+            "leverage": pos_data.get('leverage', 1.0),
+            "margin": pos_data.get('margin', 0),
+            "margin_ratio": pos_data.get('margin_ratio', 0)
+        }
+
+    async def _fetch_balance_data(self) -> Dict[str, Dict]:
+        """
+        获取余额数据（从真实交易所）- 同时获取交易账户和资金账户
+
+        交易所异常直接抛出：失败结果不写入 TTL 缓存，下一次请求会重新获取；
+        各接口在本地处理失败（空余额 / 零权益）
+        """
+        if self._exchange is None:
+            logger.error("Bot 没有配置交易所实例")
+            return {}
+        exchange = self._exchange
+
+        # 并发获取交易账户余额和资金账户余额（现金账户）
+        if self._get_asset_balance is None:
+            trading_balance, asset_balance = await exchange.get_balance(), {}
+        else:
+            trading_balance, asset_balance = await asyncio.gather(
+                exchange.get_balance(),
+                self._get_asset_balance()
+            )
+
+        # 合并两个账户的余额
+        combined_balance = {}
+        all_currencies = set(trading_balance.keys()) | set(asset_balance.keys())
+
+        for ccy in all_currencies:
+            trading = trading_balance.get(ccy, {})
+            asset = asset_balance.get(ccy, {})
+
+            combined_balance[ccy] = {
+                'total': (trading.get('total', 0) + asset.get('total', 0)),
+                'available': (trading.get('available', 0) + asset.get('available', 0)),
+                'frozen': (trading.get('frozen', 0) + asset.get('frozen', 0)),
+                'trading': trading,  # 交易账户余额
+                'asset': asset       # 资金账户余额
+            }
+
+        logger.debug("获取双账户余额成功: %d 种货币", len(combined_balance))
+        return combined_balance
+
+    async def _fetch_unrealized_pnl(self) -> float:
         """获取未实现盈亏"""
         try:
             total_pnl = 0.0
 
-            if hasattr(self.bot, 'position_manager'):
-                position_dict = self.bot.position_manager.to_dict()
+            if self._position_manager is not None:
+                position_dict = await self._get_position_dict()
 
                 for pos_data in position_dict.values():
                     if isinstance(pos_data, dict):
@@ -650,11 +761,33 @@ class APIExtension:
             logger.error(f"获取未实现盈亏失败: {e}")
             return 0.0
 
+    @staticmethod
+    def _ndjson_response(rows: List[Dict]) -> StreamingResponse:
+        """以 NDJSON 流式返回，逐行编码，编码与网络发送交错进行"""
+        def iter_lines():
+            for row in rows:
+                yield dumps_bytes(row) + b"\n"
+
+        return StreamingResponse(iter_lines(), media_type="application/x-ndjson")
+
+    def _mock_response(self, kind: str, symbol: str, limit: int = 0, interval: str = "") -> Response:
+        """返回模拟数据响应，同一秒内相同参数直接复用已序列化的字节"""
+        payload = self._mock_payload_cache(kind, symbol, limit, interval, int(time.time()))
+        return Response(content=payload, media_type="application/json")
+
+    def _build_mock_payload(self, kind: str, symbol: str, limit: int, interval: str, bucket: int) -> bytes:
+        """生成并序列化模拟数据（bucket 仅用于缓存按秒失效）"""
+        if kind == "orderbook":
+            data = self._get_mock_orderbook(symbol, limit)
+        elif kind == "ticker":
+            data = self._get_mock_ticker(symbol)
+        else:
+            data = self._get_mock_klines(symbol, interval, limit)
+        return dumps_bytes(data)
+
     def _get_mock_orderbook(self, symbol: str, limit: int) -> Dict:
         """获取模拟订单簿"""
-        import random
-
-        base_price = 50000.0 if 'BTC' in symbol else 3000.0
+        base_price = _mock_base_price(symbol)
         tick_size = base_price * 0.0001
 
         bids = []
@@ -673,14 +806,12 @@ class APIExtension:
             "symbol": symbol,
             "bids": bids,
             "asks": asks,
-            "timestamp": datetime.now().timestamp()
+            "timestamp": time.time()
         }
 
     def _get_mock_ticker(self, symbol: str) -> Dict:
         """获取模拟 Ticker"""
-        import random
-
-        base_price = 50000.0 if 'BTC' in symbol else 3000.0
+        base_price = _mock_base_price(symbol)
         price_change = random.uniform(-500, 500)
 
         return {
@@ -695,49 +826,45 @@ class APIExtension:
             "volume_24h": random.uniform(1000, 5000),
             "high_24h": round(base_price + 1000, 2),
             "low_24h": round(base_price - 1000, 2),
-            "timestamp": datetime.now().timestamp()
+            "timestamp": time.time()
         }
 
     def _get_mock_klines(self, symbol: str, interval: str, limit: int) -> List[Dict]:
         """获取模拟 K 线数据"""
-        import random
-
-        base_price = 50000.0 if 'BTC' in symbol else 3000.0
-        klines = []
-
-        # 间隔映射（秒）
-        interval_map = {
-            "1m": 60,
-            "5m": 300,
-            "15m": 900,
-            "30m": 1800,
-            "1h": 3600,
-            "4h": 14400,
-            "1d": 86400,
-            "1w": 604800
-        }
-
-        interval_seconds = interval_map.get(interval, 3600)
-        now = datetime.now().timestamp()
-
-        for i in range(limit):
-            timestamp = now - (limit - i) * interval_seconds
-            price = base_price + random.uniform(-500, 500)
-            klines.append({
-                "timestamp": int(timestamp),
-                "open": round(price + random.uniform(-10, 10), 2),
-                "high": round(price + random.uniform(0, 20), 2),
-                "low": round(price - random.uniform(0, 20), 2),
-                "close": round(price + random.uniform(-10, 10), 2),
-                "volume": round(random.uniform(10, 100), 2)
-            })
+        base_price = _mock_base_price(symbol)
+
+        interval_seconds = _INTERVAL_SECONDS.get(interval, 3600)
+        now = time.time()
+
+        # 整批生成各列随机数，避免逐根 K 线调用 random
+        rng = np.random.default_rng()
+        price = base_price + rng.uniform(-500, 500, limit)
+        timestamps = (now - (limit - np.arange(limit)) * interval_seconds).astype(np.int64)
+        opens = np.round(price + rng.uniform(-10, 10, limit), 2)
+        highs = np.round(price + rng.uniform(0, 20, limit), 2)
+        lows = np.round(price - rng.uniform(0, 20, limit), 2)
+        closes = np.round(price + rng.uniform(-10, 10, limit), 2)
+        volumes = np.round(rng.uniform(10, 100, limit), 2)
+
+        klines = [
+            {
+                "timestamp": ts,
+                "open": o,
+                "high": h,
+                "low": lo,
+                "close": c,
+                "volume": v
+            }
+            for ts, o, h, lo, c, v in zip(
+                timestamps.tolist(), opens.tolist(), highs.tolist(),
+                lows.tolist(), closes.tolist(), volumes.tolist()
+            )
+        ]
 
         return klines
 
     def _generate_mock_backtest_result(self, strategy: str, config: dict, start_time: int, end_time: int) -> Dict:
         """生成模拟回测结果"""
-        import random
-
         # 生成权益曲线
         equity_curve = []
         equity = 10000.0
@@ -792,3 +919,17 @@ class APIExtension:
         }
 
     # ==================== 数据管理 ====================
+
+    def add_trade(self, trade: Dict):
+        """记录一笔成交（同时写入按交易对的索引）"""
+        self._trade_history.append(trade)
+        self._trade_history_by_symbol[trade.get('symbol', '')].append(trade)
+
+    def add_pnl_record(self, record: Dict):
+        """追加一条 PnL 记录（timestamp 需单调不减）"""
+        self._pnl_history.append(record)
+        self._pnl_timestamps.append(record['timestamp'])
+        excess = len(self._pnl_history) - PNL_HISTORY_LIMIT
+        if excess >= PNL_HISTORY_TRIM:
+            del self._pnl_history[:excess]
+            del self._pnl_timestamps[:excess]
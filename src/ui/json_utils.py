@@ -0,0 +1,124 @@
+"""
+JSON 序列化工具
+优先使用 orjson（未安装时回退标准库 json）；可选 MessagePack 编码用于二进制 WebSocket 帧
+"""
+import hashlib
+import json
+import traceback
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:
+    # ormsgpack 为可选依赖，未安装时不提供 MessagePack 编码
+    ormsgpack = None
+
+MSGPACK_AVAILABLE = ormsgpack is not None
+
+
+def _default(obj: Any) -> Any:
+    """处理 JSON 不原生支持的类型（交易所返回的 Decimal、集合等）"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON 字节"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """
+    解析 JSON 文本或字节
+
+    解析失败时抛出 json.JSONDecodeError（orjson.JSONDecodeError 是其子类）
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_text(obj: Any) -> str:
+    """序列化为 JSON 字符串（用于 WebSocket 文本帧）"""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def packb(obj: Any) -> bytes:
+    """序列化为 MessagePack 字节（需安装 ormsgpack）"""
+    return ormsgpack.packb(obj, default=_default,
+                           option=ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    使用 dumps_bytes 渲染的 JSON 响应（FastAPI 默认响应类）
+
+    路由直接返回该响应时跳过 jsonable_encoder 的逐字段转换
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+def error_response(exc: Exception, debug: bool = False, status_code: int = 500) -> FastJSONResponse:
+    """
+    构造错误响应
+
+    traceback 仅在 debug 模式下返回，避免每次出错都格式化调用栈并泄露到客户端
+    """
+    content = {"error": str(exc)}
+    if debug:
+        content["traceback"] = "".join(traceback.format_exception(exc))
+    return FastJSONResponse(content, status_code=status_code)
+
+
+def compute_etag(body: bytes) -> str:
+    """根据响应体计算强 ETag"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def cached_json_response(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """
+    使用已序列化的 JSON 字节构造响应；客户端 If-None-Match 命中时返回 304 且不带响应体
+
+    Args:
+        request: 当前请求
+        body: 已序列化的响应体
+        etag: 响应体对应的 ETag
+        cache_control: Cache-Control 头
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def etag_response(request: Request, content: Any, max_age: int = 1) -> Response:
+    """
+    带 ETag 的 JSON 响应
+
+    Args:
+        request: 当前请求
+        content: 响应数据
+        max_age: Cache-Control 的 max-age（秒）
+    """
+    body = dumps_bytes(content)
+    return cached_json_response(request, body, compute_etag(body), f"max-age={max_age}")
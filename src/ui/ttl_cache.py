@@ -0,0 +1,55 @@
+"""
+异步 TTL 缓存
+合并面板高频轮询对交易所的重复请求
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class AsyncTTLCache:
+    """
+    短时 TTL 缓存：TTL 内的重复请求直接复用上次结果，不再访问交易所；
+    缓存失效时并发调用方合并为一次请求（single-flight）
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # key -> (值, monotonic 时间戳)
+        self._entries: Dict[Hashable, tuple] = {}
+        # 进行中的请求：key -> Task，并发调用方共享同一次交易所请求
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        获取缓存值，过期或不存在时调用 fetch
+
+        Args:
+            key: 缓存键
+            fetch: 无参协程函数，缓存失效时调用
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+
+        # 检查与登记之间没有 await，单线程事件循环下无需额外加锁
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+
+        # shield：单个调用方被取消时不影响其他调用方共享的请求
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """执行请求并写入缓存"""
+        try:
+            value = await fetch()
+            self._entries[key] = (value, time.monotonic())
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        """清空缓存（进行中的请求不受影响）"""
+        self._entries.clear()
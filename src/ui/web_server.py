@@ -2,24 +2,102 @@
 Web 服务器 - 支持多策略实例管理
 提供 REST API 和 WebSocket 接口
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from typing import Deque, Dict, List, Optional, Set, Tuple
 import json
 import logging
-import sys
 import asyncio
+import functools
+import heapq
+import time
+from collections import deque
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 # 导入 API 扩展
 from .api_extension import APIExtension
+from .ttl_cache import AsyncTTLCache
+from .json_utils import (
+    MSGPACK_AVAILABLE, FastJSONResponse, cached_json_response, compute_etag, dumps_bytes, dumps_text,
+    error_response, loads, packb
+)
 # 导入命令处理器
 from ..core.ws_command_handler import WSCommandHandler
 
+# API 根路径返回的服务索引（内容固定，导入时序列化一次）
+_ROOT_INDEX_BODY = dumps_bytes({
+    "service": "Hummingbot Lite Trading API",
+    "version": "2.0.0",
+    "endpoints": {
+        "websocket": "/ws",
+        "api_stream": "/api/stream",
+        "logs_websocket": "/ws/logs",
+        "command": "/api/command",
+        "state": "/api/state",
+        "health": "/api/health"
+    }
+})
+_ROOT_INDEX_ETAG = compute_etag(_ROOT_INDEX_BODY)
+
+# 状态数据中 PnL 字段保留的小数位（前端按 4 位小数展示）；价格与数量不做舍入，避免低价币种丢失精度
+PNL_DECIMALS = 4
+
+
+def _round_pnl_fields(positions: Dict) -> Dict:
+    """舍入 position_manager.to_dict() 结果中的 PnL 字段（原地修改并返回）"""
+    for key in ("total_unrealized_pnl", "total_realized_pnl"):
+        value = positions.get(key)
+        if isinstance(value, (int, float)):
+            positions[key] = round(value, PNL_DECIMALS)
+    for position in positions.get("open_positions", {}).values():
+        for key in ("unrealized_pnl", "realized_pnl"):
+            value = position.get(key)
+            if isinstance(value, (int, float)):
+                position[key] = round(value, PNL_DECIMALS)
+    return positions
+
+
+# 转发给 WebSocket 客户端的事件总线事件类型
+_FORWARDED_EVENT_TYPES = (
+    "connected", "disconnected", "system_status",
+    "price", "order_update", "trade", "position", "balance",
+    "strategy", "log", "connection", "error", "snapshot"
+)
+
+# 常见的心跳消息文本（JSON.stringify / json.dumps 的输出），命中时跳过 JSON 解析与日志
+_PING_MESSAGES = frozenset(('{"type":"ping"}', '{"type": "ping"}'))
+# 心跳响应（固定内容，预先序列化）
+_PONG_MESSAGE = '{"type":"pong"}'
+
+# broadcast_event 合并窗口（秒）与待推送行情类事件上限（超出时丢弃最旧的行情事件）
+EVENT_BATCH_WINDOW = 0.02
+EVENT_QUEUE_SIZE = 256
+
+# 可丢弃的行情类事件：新值覆盖旧值，积压时只保留最新的 EVENT_QUEUE_SIZE 条；
+# 订单、成交、仓位等其他事件从不丢弃
+_DROPPABLE_EVENT_TYPES = frozenset(("price", "system_status", "balance"))
+
+# 每个 WebSocket 客户端的待发送帧上限；队列写满说明客户端消费过慢，断开该连接
+CLIENT_QUEUE_SIZE = 256
+# 断开慢客户端时 close 帧的发送超时（秒）
+CLIENT_CLOSE_TIMEOUT = 1.0
+
+# uvicorn 运行参数
+# - loop/http 为 auto 时优先使用 uvicorn[standard] 附带的 uvloop / httptools
+# - 请求日志已由 log_requests 中间件记录，关闭 uvicorn access log 避免每个请求记录两次
+# - 启用 permessage-deflate 压缩 WebSocket 帧
+UVICORN_OPTIONS = {
+    "loop": "auto",
+    "http": "auto",
+    "access_log": False,
+    "ws_per_message_deflate": True
+}
+
 
 class WebServer:
     """Web 服务器"""
@@ -27,10 +105,44 @@ class WebServer:
     def __init__(self, config: Dict, bot_instance, ws_log_handler=None):
         self.config = config
         self.bot = bot_instance
-        self.app = FastAPI(title="Hummingbot Lite")
-        self.websocket_clients = []
+        self.app = FastAPI(title="Hummingbot Lite", default_response_class=FastJSONResponse)
+        self.websocket_clients: Set[WebSocket] = set()
+        # 使用 MessagePack 二进制帧接收推送的客户端（websocket_clients 的子集）
+        self._msgpack_clients: Set[WebSocket] = set()
+        # 每个客户端独立的发送队列与写任务，慢客户端不会拖慢其他客户端的推送
+        self._client_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._client_writers: Dict[WebSocket, asyncio.Task] = {}
+        # 正在断开的慢客户端（保留任务引用直到 close 完成）
+        self._closing_tasks: Set[asyncio.Task] = set()
         self.ws_log_handler = ws_log_handler
 
+        # /api/status 响应缓存（已序列化的字节 + ETag），1 秒内的请求共享同一次采集
+        self._status_body: Optional[bytes] = None
+        self._status_etag = ""
+        self._status_cache = AsyncTTLCache(ttl=1.0)
+        # 状态字段复用同一个 dict；状态未变化时保留旧响应体与 ETag
+        self._status_fields: Dict = {}
+        self._status_fields_hash: Optional[int] = None
+
+        # /api/strategy-instances 响应缓存，REST 接口变更实例时立即失效
+        self._instances_body: Optional[bytes] = None
+        self._instances_updated_at = 0.0
+        self._instances_ttl = 1.0
+
+        # 交易所余额 / 挂单查询缓存，合并面板的突发刷新
+        self._exchange_cache = AsyncTTLCache(ttl=0.5)
+
+        # broadcast_event 待推送事件 (序号, 事件帧)，EVENT_BATCH_WINDOW 内的事件合并为一帧发送；
+        # 行情类事件单独存放并限制数量，其他事件不丢弃，发送时按序号合并恢复原始顺序
+        self._pending_events: List[Tuple[int, Dict]] = []
+        self._pending_market_events: Deque[Tuple[int, Dict]] = deque(maxlen=EVENT_QUEUE_SIZE)
+        self._event_seq = 0
+        self._event_flush_task: Optional[asyncio.Task] = None
+
+        # 按秒缓存的 UTC 时间戳字符串（状态类数据 1 秒精度足够）
+        self._ts_second = -1
+        self._ts = ""
+
         # ✅ 添加 CORS 中间件
         self.app.add_middleware(
             CORSMiddleware,
@@ -40,6 +152,9 @@ class WebServer:
             allow_headers=["*"],  # 允许所有请求头
         )
 
+        # ✅ 响应压缩（小于 500 字节的响应不压缩，压缩开销大于收益）
+        self.app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
         # ✅ 添加请求日志中间件
         @self.app.middleware("http")
         async def log_requests(request, call_next):
@@ -68,13 +183,8 @@ class WebServer:
         # 添加全局异常处理
         @self.app.exception_handler(Exception)
         async def global_exception_handler(request, exc):
-            import traceback
-            logger.error(f"Global exception caught: {exc}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return {
-                "error": str(exc),
-                "traceback": traceback.format_exc()
-            }
+            logger.error("Global exception caught: %s", exc, exc_info=exc)
+            return error_response(exc, self.app.debug)
 
         # 获取策略管理器（如果有）
         self.strategy_manager = getattr(bot_instance, 'strategy_manager', None)
@@ -88,6 +198,10 @@ class WebServer:
             self.command_handler = WSCommandHandler(bot_instance, self.event_bus)
             logger.info("WebSocket 命令处理器初始化完成")
 
+            # 整个服务只订阅一次事件总线，事件进入待推送队列合并后广播给所有客户端
+            for event_type in _FORWARDED_EVENT_TYPES:
+                self.event_bus.subscribe(event_type, self._forward_bus_event)
+
         # 设置路由
         self._setup_routes()
         self._setup_websocket()
@@ -106,69 +220,58 @@ class WebServer:
         """设置 API 路由"""
 
         @self.app.get("/")
-        async def get_root():
-            """API 根路径"""
-            return {
-                "service": "Hummingbot Lite Trading API",
-                "version": "2.0.0",
-                "endpoints": {
-                    "websocket": "/ws",
-                    "api_stream": "/api/stream",
-                    "logs_websocket": "/ws/logs",
-                    "command": "/api/command",
-                    "state": "/api/state",
-                    "health": "/api/health"
-                }
-            }
+        async def get_root(request: Request):
+            """API 根路径（内容固定，使用预序列化的响应体）"""
+            return cached_json_response(request, _ROOT_INDEX_BODY, _ROOT_INDEX_ETAG, "public, max-age=3600")
 
         # ============ 基础接口 ============
 
         @self.app.get("/api/health")
         async def health_check():
             """健康检查"""
-            return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
-            """获取机器人状态"""
-            return {
-                "status": "running" if self.bot.is_running else "stopped",
-                "strategy": self.bot.strategy.get_status() if self.bot.strategy else None,
-                "positions": self.bot.position_manager.to_dict(),
-                "risk": self.bot.risk_manager.to_dict(),
-                "exchange": self.bot.exchange.to_dict(),
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return FastJSONResponse({"status": "ok", "timestamp": self._timestamp()})
+
+        @self.app.get("/api/status")
+        async def get_status(request: Request):
+            """获取机器人状态（缓存 1 秒，支持 ETag / 304）"""
+            body = await self._get_status_body()
+            return cached_json_response(
+                request,
+                body,
+                self._status_etag,
+                "public, max-age=1, stale-while-revalidate=5"
+            )
 
         @self.app.get("/api/balance")
         async def get_balance():
             """获取账户余额"""
             try:
-                balance = await self.bot.exchange.get_balance()
-                return {"balance": balance, "timestamp": datetime.utcnow().isoformat()}
+                balance = await self._exchange_cache.get("balance", self.bot.exchange.get_balance)
+                return FastJSONResponse(
+                    {"balance": balance, "timestamp": self._timestamp()},
+                    headers={"Cache-Control": "max-age=1"}
+                )
             except Exception as e:
-                import traceback
-                print(f"Exception caught: {e}", file=sys.stderr)
-                print(f"Traceback: {traceback.format_exc()}", file=sys.stderr)
-                error_details = {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
-                return error_details
+                logger.exception("获取余额失败: %s", e)
+                return error_response(e, self.app.debug)
 
         @self.app.get("/api/orders")
         async def get_orders():
             """获取订单列表"""
             try:
-                symbol = self.bot.strategy.trading_pair if self.bot.strategy else None
-                orders = await self.bot.exchange.get_open_orders(symbol)
-                return {"orders": orders, "count": len(orders)}
+                strategy = self.bot.strategy
+                symbol = strategy.trading_pair if strategy else None
+                orders = await self._exchange_cache.get(
+                    ("orders", symbol),
+                    functools.partial(self.bot.exchange.get_open_orders, symbol)
+                )
+                return FastJSONResponse(
+                    {"orders": orders, "count": len(orders)},
+                    headers={"Cache-Control": "max-age=1"}
+                )
             except Exception as e:
-                import traceback
-                print(f"Exception caught: {e}", file=sys.stderr)
-                print(f"Traceback: {traceback.format_exc()}", file=sys.stderr)
-                error_details = {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
-                return error_details
+                logger.exception("获取订单失败: %s", e)
+                return error_response(e, self.app.debug)
 
         @self.app.post("/api/start")
         async def start_strategy():
@@ -179,7 +282,8 @@ class WebServer:
                     return {"status": "started", "message": "Strategy started"}
                 return {"status": "error", "message": "Strategy already running or not initialized"}
             except Exception as e:
-                return {"status": "error", "message": str(e)}
+                logger.exception("启动策略失败: %s", e)
+                return FastJSONResponse({"status": "error", "message": str(e)}, status_code=500)
 
         @self.app.post("/api/stop")
         async def stop_strategy():
@@ -190,24 +294,20 @@ class WebServer:
                     return {"status": "stopped", "message": "Strategy stopped"}
                 return {"status": "error", "message": "Strategy not running"}
             except Exception as e:
-                return {"status": "error", "message": str(e)}
+                logger.exception("停止策略失败: %s", e)
+                return FastJSONResponse({"status": "error", "message": str(e)}, status_code=500)
 
         @self.app.post("/api/cancel-all-orders")
         async def cancel_all_orders():
             """取消所有订单"""
             try:
-                symbol = self.bot.strategy.trading_pair if self.bot.strategy else None
+                strategy = self.bot.strategy
+                symbol = strategy.trading_pair if strategy else None
                 cancelled = await self.bot.exchange.cancel_all_orders(symbol)
                 return {"cancelled": cancelled, "message": f"Cancelled {cancelled} orders"}
             except Exception as e:
-                import traceback
-                print(f"Exception caught: {e}", file=sys.stderr)
-                print(f"Traceback: {traceback.format_exc()}", file=sys.stderr)
-                error_details = {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
-                return error_details
+                logger.exception("撤销订单失败: %s", e)
+                return error_response(e, self.app.debug)
 
         # ============ 多策略管理接口 ============
 
@@ -218,7 +318,7 @@ class WebServer:
                 return {"strategies": []}
 
             strategies = self.strategy_manager.get_available_strategies()
-            return {"strategies": strategies}
+            return FastJSONResponse({"strategies": strategies})
 
         @self.app.get("/api/strategy-instances")
         async def get_strategy_instances():
@@ -226,8 +326,10 @@ class WebServer:
             if not self.strategy_manager:
                 return {"instances": []}
 
-            instances = self.strategy_manager.get_instances_summary()
-            return {"instances": instances}
+            if self._instances_body is None or time.monotonic() - self._instances_updated_at >= self._instances_ttl:
+                self._instances_body = dumps_bytes({"instances": self.strategy_manager.get_instances_summary()})
+                self._instances_updated_at = time.monotonic()
+            return Response(content=self._instances_body, media_type="application/json")
 
         @self.app.get("/api/strategy-instances/{instance_id}")
         async def get_strategy_instance(instance_id: str):
@@ -239,7 +341,7 @@ class WebServer:
             if not instance:
                 return {"error": "Instance not found"}
 
-            return {
+            return FastJSONResponse({
                 "instance_id": instance.instance_id,
                 "strategy_name": instance.strategy_name,
                 "config": instance.config,
@@ -247,35 +349,29 @@ class WebServer:
                 "created_at": instance.created_at,
                 "last_active": instance.last_active,
                 "status": instance.strategy.get_status() if instance.strategy else {}
-            }
+            })
 
         @self.app.post("/api/strategy-instances")
         async def create_strategy_instance(request: dict):
             """创建策略实例"""
-            print(f"create_strategy_instance called", file=sys.stderr)
-            logger.info(f"create_strategy_instance called: {request}")
             if not self.strategy_manager:
-                print(f"Strategy manager not available", file=sys.stderr)
                 return {"error": "Strategy manager not available"}
 
-            print(f"About to enter try block", file=sys.stderr)
             try:
-                print(f"In try block, getting strategy_name", file=sys.stderr)
                 strategy_name = request.get('strategy_name')
                 config = request.get('config', {})
                 instance_name = request.get('instance_name')
+                logger.debug("create_strategy_instance: name=%s config=%s", strategy_name, config)
 
-                print(f"strategy_name: {strategy_name}", file=sys.stderr)
                 if not strategy_name:
                     return {"error": "strategy_name is required"}
 
-                print(f"About to call create_strategy_instance", file=sys.stderr)
                 instance = await self.strategy_manager.create_strategy_instance(
                     strategy_name=strategy_name,
                     config=config,
                     instance_name=instance_name
                 )
-                print(f"Strategy instance created successfully", file=sys.stderr)
+                self._on_instances_changed(instance.instance_id)
 
                 return {
                     "instance_id": instance.instance_id,
@@ -284,14 +380,8 @@ class WebServer:
                 }
 
             except Exception as e:
-                import traceback
-                print(f"Exception caught: {e}", file=sys.stderr)
-                print(f"Traceback: {traceback.format_exc()}", file=sys.stderr)
-                error_details = {
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }
-                return error_details
+                logger.exception("创建策略实例失败: %s", e)
+                return error_response(e, self.app.debug)
 
         @self.app.post("/api/strategy-instances/{instance_id}/start")
         async def start_strategy_instance(instance_id: str):
@@ -301,6 +391,7 @@ class WebServer:
 
             success = await self.strategy_manager.start_strategy(instance_id)
             if success:
+                self._on_instances_changed(instance_id)
                 return {"status": "started", "instance_id": instance_id}
             return {"error": "Failed to start strategy instance"}
 
@@ -312,6 +403,7 @@ class WebServer:
 
             success = await self.strategy_manager.stop_strategy(instance_id)
             if success:
+                self._on_instances_changed(instance_id)
                 return {"status": "stopped", "instance_id": instance_id}
             return {"error": "Failed to stop strategy instance"}
 
@@ -323,6 +415,7 @@ class WebServer:
 
             success = await self.strategy_manager.delete_strategy_instance(instance_id)
             if success:
+                self._on_instances_changed(instance_id)
                 return {"status": "deleted", "instance_id": instance_id}
             return {"error": "Failed to delete strategy instance"}
 
@@ -336,8 +429,8 @@ class WebServer:
                 instance_id,
                 request.get('config', {})
             )
-
             if success:
+                self._on_instances_changed(instance_id)
                 return {"status": "updated", "instance_id": instance_id}
             return {"error": "Failed to update strategy config"}
 
@@ -350,31 +443,43 @@ class WebServer:
                 return {"error": "Strategy manager not available"}
 
             try:
-                # 1. 停止所有运行中的策略
+                # 1. 并发停止所有运行中的策略（先全部停止，避免撤单后策略继续挂新单）
                 instances = self.strategy_manager.get_instances_summary()
-                stopped_count = 0
-                cancelled_count = 0
-
-                for instance in instances:
-                    if instance.get('is_running'):
-                        await self.strategy_manager.stop_strategy(instance['instance_id'])
-                        stopped_count += 1
+                results = await asyncio.gather(
+                    *(self.strategy_manager.stop_strategy(instance['instance_id'])
+                      for instance in instances if instance.get('is_running')),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error("Kill Switch failed to stop strategy: %s", result)
+                stopped_count = sum(1 for result in results if result is True)
+                self._on_instances_changed(None)
 
-                # 2. 撤销所有订单
+                # 2. 撤销所有订单；撤单失败单独报告，不影响已停止策略的结果
+                cancelled_count = 0
+                cancel_error = None
                 if self.bot and hasattr(self.bot, 'exchange'):
-                    cancelled_count = await self.bot.exchange.cancel_all_orders()
+                    try:
+                        cancelled_count = await self.bot.exchange.cancel_all_orders()
+                    except Exception as e:
+                        logger.exception("Kill Switch failed to cancel orders: %s", e)
+                        cancel_error = str(e)
 
                 logger.error(f"Kill Switch executed: stopped {stopped_count} strategies, cancelled {cancelled_count} orders")
 
-                return {
+                response = {
                     "status": "kill_switch_activated",
                     "stopped_strategies": stopped_count,
                     "cancelled_orders": cancelled_count,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": self._timestamp()
                 }
+                if cancel_error is not None:
+                    response["cancel_error"] = cancel_error
+                return response
             except Exception as e:
-                logger.error(f"Kill Switch failed: {e}")
-                return {"error": f"Kill Switch failed: {str(e)}"}
+                logger.exception("Kill Switch failed: %s", e)
+                return FastJSONResponse({"error": f"Kill Switch failed: {e}"}, status_code=500)
 
     def _setup_websocket(self):
         """设置 WebSocket"""
@@ -383,47 +488,11 @@ class WebServer:
         async def websocket_endpoint(websocket: WebSocket):
             """通用 WebSocket 端点 - 用于事件广播"""
             await websocket.accept()
-            self.websocket_clients.append(websocket)
+            self._register_client(websocket)
             logger.info("WebSocket client connected to /ws")
 
-            # 如果有事件总线，订阅所有事件并推送给客户端
+            # 事件总线事件由 _forward_bus_event 统一合并推送
             if self.event_bus:
-                # 订阅事件总线并推送给客户端
-                async def event_forwarder(event):
-                    try:
-                        # 检查连接是否还活着
-                        if websocket.client_state.name != 'CONNECTED':
-                            logger.debug(f"⚠️ [WS] WebSocket is not connected (state: {websocket.client_state.name}), skipping event")
-                            return
-
-                        # 尝试发送消息
-                        message = json.dumps(event, ensure_ascii=False)
-                        await websocket.send_text(message)
-                        logger.debug(f"✅ [WS] Event sent to client: {event.get('type')}")
-
-                    except RuntimeError as e:
-                        # WebSocket 连接已关闭
-                        if 'websocket.close' in str(e) or 'already completed' in str(e):
-                            logger.debug(f"⚠️ [WS] WebSocket connection closed, stopping event forwarding: {e}")
-                            # 从所有订阅中移除此回调
-                            for event_type in event_types:
-                                self.event_bus.unsubscribe(event_type, event_forwarder)
-                        else:
-                            logger.error(f"❌ [WS] WebSocket runtime error: {e}", exc_info=True)
-
-                    except Exception as e:
-                        logger.error(f"❌ [WS] Failed to send event to client: {e}", exc_info=True)
-
-                # 订阅所有事件类型
-                event_types = [
-                    "connected", "disconnected", "system_status",
-                    "price", "order_update", "trade", "position", "balance",
-                    "strategy", "log", "connection", "error", "snapshot"
-                ]
-                for event_type in event_types:
-                    self.event_bus.subscribe(event_type, event_forwarder)
-                    logger.debug(f"📡 [WS] Subscribed to event type: {event_type}")
-
                 # 延迟发送连接成功事件，给前端足够的时间准备
                 async def delayed_send_connected():
                     try:
@@ -439,17 +508,28 @@ class WebServer:
             try:
                 while True:
                     data = await websocket.receive_text()
+
+                    # 心跳快速路径
+                    if data in _PING_MESSAGES:
+                        self._send_reply(websocket, _PONG_MESSAGE)
+                        continue
+
                     logger.info(f"📥 [WS] Received message from client ({len(data)} chars): {data[:200]}")
 
                     # 处理客户端发送的消息
                     try:
-                        message = json.loads(data)
+                        message = loads(data)
                         logger.info(f"📝 [WS] Parsed message: {message}")
 
                         # 处理心跳消息
                         if message.get("type") == "ping":
                             logger.debug("Received ping, sending pong")
-                            await websocket.send_text(json.dumps({"type": "pong"}))
+                            self._send_reply(websocket, _PONG_MESSAGE)
+                            continue
+
+                        # 客户端请求状态快照：直接复用 /api/status 的缓存响应体
+                        if message.get("type") == "get_status":
+                            self._send_reply(websocket, await self._get_status_frame())
                             continue
 
                         # 处理命令
@@ -457,23 +537,22 @@ class WebServer:
                         logger.info(f"⚡ [WS] Processing command: {command.get('cmd', 'unknown')}")
                         if self.command_handler:
                             response = await self.command_handler.handle_command(command)
-                            await websocket.send_text(json.dumps(response))
+                            self._send_reply(websocket, dumps_text(response))
                             logger.info(f"📤 [WS] Command response sent - Success: {response.get('success')}, Data: {response.get('data', {})}")
                         else:
                             logger.warning(f"⚠️ [WS] No command handler available")
-                            await websocket.send_text(json.dumps({"success": False, "error": "No command handler"}))
+                            self._send_reply(websocket, dumps_text({"success": False, "error": "No command handler"}))
                     except json.JSONDecodeError as e:
                         logger.warning(f"Invalid JSON received: {data}, error: {e}")
                     except Exception as e:
                         logger.error(f"Error handling WebSocket message: {e}", exc_info=True)
 
             except WebSocketDisconnect as e:
-                self.websocket_clients.remove(websocket)
+                self._remove_client(websocket)
                 logger.info(f"WebSocket client disconnected from /ws (code: {e.code}, reason: {e.reason})")
             except Exception as e:
                 logger.error(f"WebSocket error: {e}", exc_info=True)
-                if websocket in self.websocket_clients:
-                    self.websocket_clients.remove(websocket)
+                self._remove_client(websocket)
 
         @self.app.websocket("/api/stream")
         async def api_stream_endpoint(websocket: WebSocket):
@@ -483,47 +562,11 @@ class WebServer:
             logger.info(f"🔗 [WS] New WebSocket connection attempt from {client_host}:{client_port}")
 
             await websocket.accept()
-            self.websocket_clients.append(websocket)
+            self._register_client(websocket)
             logger.info(f"✅ [WS] WebSocket client connected to /api/stream - Total clients: {len(self.websocket_clients)}")
 
-            # 如果有事件总线，订阅所有事件并推送给客户端
+            # 事件总线事件由 _forward_bus_event 统一合并推送
             if self.event_bus:
-                # 订阅事件总线并推送给客户端
-                async def event_forwarder(event):
-                    try:
-                        # 检查连接是否还活着
-                        if websocket.client_state.name != 'CONNECTED':
-                            logger.debug(f"⚠️ [WS] WebSocket is not connected (state: {websocket.client_state.name}), skipping event")
-                            return
-
-                        # 尝试发送消息
-                        message = json.dumps(event, ensure_ascii=False)
-                        await websocket.send_text(message)
-                        logger.debug(f"✅ [WS] Event sent to client: {event.get('type')}")
-
-                    except RuntimeError as e:
-                        # WebSocket 连接已关闭
-                        if 'websocket.close' in str(e) or 'already completed' in str(e):
-                            logger.debug(f"⚠️ [WS] WebSocket connection closed, stopping event forwarding: {e}")
-                            # 从所有订阅中移除此回调
-                            for event_type in event_types:
-                                self.event_bus.unsubscribe(event_type, event_forwarder)
-                        else:
-                            logger.error(f"❌ [WS] WebSocket runtime error: {e}", exc_info=True)
-
-                    except Exception as e:
-                        logger.error(f"❌ [WS] Failed to send event to client: {e}", exc_info=True)
-
-                # 订阅所有事件类型
-                event_types = [
-                    "connected", "disconnected", "system_status",
-                    "price", "order_update", "trade", "position", "balance",
-                    "strategy", "log", "connection", "error", "snapshot"
-                ]
-                for event_type in event_types:
-                    self.event_bus.subscribe(event_type, event_forwarder)
-                    logger.debug(f"📡 [WS] Subscribed to event type: {event_type}")
-
                 # 延迟发送连接成功事件，给前端足够的时间准备
                 async def delayed_send_connected():
                     try:
@@ -539,17 +582,28 @@ class WebServer:
             try:
                 while True:
                     data = await websocket.receive_text()
+
+                    # 心跳快速路径
+                    if data in _PING_MESSAGES:
+                        self._send_reply(websocket, _PONG_MESSAGE)
+                        continue
+
                     logger.info(f"📥 [WS] Received message from client ({len(data)} chars): {data[:200]}")
 
                     # 处理客户端发送的消息
                     try:
-                        message = json.loads(data)
+                        message = loads(data)
                         logger.info(f"📝 [WS] Parsed message: {message}")
 
                         # 处理心跳消息
                         if message.get("type") == "ping":
                             logger.debug("Received ping, sending pong")
-                            await websocket.send_text(json.dumps({"type": "pong"}))
+                            self._send_reply(websocket, _PONG_MESSAGE)
+                            continue
+
+                        # 客户端请求状态快照：直接复用 /api/status 的缓存响应体
+                        if message.get("type") == "get_status":
+                            self._send_reply(websocket, await self._get_status_frame())
                             continue
 
                         # 处理命令
@@ -557,23 +611,22 @@ class WebServer:
                         logger.info(f"⚡ [WS] Processing command: {command.get('cmd', 'unknown')}")
                         if self.command_handler:
                             response = await self.command_handler.handle_command(command)
-                            await websocket.send_text(json.dumps(response))
+                            self._send_reply(websocket, dumps_text(response))
                             logger.info(f"📤 [WS] Command response sent - Success: {response.get('success')}, Data: {response.get('data', {})}")
                         else:
                             logger.warning(f"⚠️ [WS] No command handler available")
-                            await websocket.send_text(json.dumps({"success": False, "error": "No command handler"}))
+                            self._send_reply(websocket, dumps_text({"success": False, "error": "No command handler"}))
                     except json.JSONDecodeError as e:
                         logger.warning(f"Invalid JSON received: {data}, error: {e}")
                     except Exception as e:
                         logger.error(f"Error handling WebSocket message: {e}", exc_info=True)
 
             except WebSocketDisconnect as e:
-                self.websocket_clients.remove(websocket)
+                self._remove_client(websocket)
                 logger.info(f"🔌 [WS] WebSocket client disconnected from /api/stream - Code: {e.code}, Reason: {e.reason} - Remaining clients: {len(self.websocket_clients)}")
             except Exception as e:
                 logger.error(f"❌ [WS] WebSocket error: {e}", exc_info=True)
-                if websocket in self.websocket_clients:
-                    self.websocket_clients.remove(websocket)
+                self._remove_client(websocket)
 
         @self.app.websocket("/ws/logs")
         async def logs_websocket_endpoint(websocket: WebSocket):
@@ -585,11 +638,11 @@ class WebServer:
                 self.ws_log_handler.add_client(websocket)
             
             try:
-                # 发送最近的日志给新连接的客户端
+                # 发送最近的日志给新连接的客户端（与实时推送一致，合并为一个 JSON 数组帧）
                 if self.ws_log_handler:
-                    recent_logs = self.ws_log_handler.get_recent_logs(100)
-                    for log_entry in recent_logs:
-                        await websocket.send_text(json.dumps(log_entry))
+                    recent_logs = self.ws_log_handler.get_recent_logs_message(100)
+                    if recent_logs:
+                        await websocket.send_text(recent_logs)
                 
                 # 保持连接并处理客户端消息
                 while True:
@@ -601,26 +654,245 @@ class WebServer:
                     self.ws_log_handler.remove_client(websocket)
                 logger.info("Logs WebSocket client disconnected")
 
+    def _timestamp(self) -> str:
+        """当前 UTC 时间的 ISO 字符串，同一秒内复用"""
+        second = int(time.time())
+        if second != self._ts_second:
+            self._ts = datetime.utcnow().isoformat()
+            self._ts_second = second
+        return self._ts
+
+    def _register_client(self, websocket: WebSocket) -> bool:
+        """
+        登记 WebSocket 客户端
+
+        连接参数 format=msgpack 时推送帧使用 MessagePack 二进制编码（需安装 ormsgpack），
+        命令响应仍为 JSON 文本
+
+        Returns:
+            是否使用 MessagePack 推送
+        """
+        self.websocket_clients.add(websocket)
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._client_queues[websocket] = queue
+        self._client_writers[websocket] = asyncio.create_task(self._client_writer(websocket, queue))
+        if websocket.query_params.get("format") != "msgpack":
+            return False
+        if not MSGPACK_AVAILABLE:
+            logger.warning("ormsgpack 未安装，WebSocket 客户端回退为 JSON 推送")
+            return False
+        self._msgpack_clients.add(websocket)
+        return True
+
+    def _remove_client(self, websocket: WebSocket):
+        """移除 WebSocket 客户端"""
+        self.websocket_clients.discard(websocket)
+        self._msgpack_clients.discard(websocket)
+        self._client_queues.pop(websocket, None)
+        writer = self._client_writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def _client_writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """按顺序发送单个客户端队列中的帧（文本帧为 str，MessagePack 帧为 bytes）"""
+        try:
+            while True:
+                frame = await queue.get()
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Failed to send message to WebSocket client: %s", e)
+            self._remove_client(websocket)
+
+    def _send_reply(self, websocket: WebSocket, frame: str):
+        """
+        将对单个客户端的响应（pong、命令响应、状态快照）放入其发送队列，
+        与推送帧共用同一个写任务，保证帧顺序；队列已满时按慢客户端处理
+        """
+        queue = self._client_queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._drop_slow_client(websocket)
+            logger.warning("Dropped slow WebSocket client: send queue full")
+
+    def _drop_slow_client(self, websocket: WebSocket):
+        """发送队列已满：移除客户端并关闭连接，前端重连后通过 get_status 重新同步"""
+        self._remove_client(websocket)
+        task = asyncio.create_task(self._close_client(websocket))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def _close_client(self, websocket: WebSocket):
+        """关闭客户端连接（1013 Try Again Later），超时或连接已断开时忽略"""
+        try:
+            await asyncio.wait_for(websocket.close(code=1013), timeout=CLIENT_CLOSE_TIMEOUT)
+        except Exception:
+            pass
+
+    async def _get_status_body(self) -> bytes:
+        """获取已序列化的机器人状态（TTL 缓存，并发请求共享同一次采集）"""
+        return await self._status_cache.get("status", self._refresh_status_cache)
+
+    async def _get_status_frame(self) -> str:
+        """
+        构造 WebSocket get_status 的响应帧
+
+        采集失败时返回 error 帧（格式同 EventBus.publish_error），客户端不会一直等待响应
+        """
+        try:
+            status_body = await self._get_status_body()
+        except Exception as e:
+            logger.error("Failed to collect status for get_status: %s", e, exc_info=True)
+            return dumps_text({
+                "type": "error",
+                "timestamp": self._timestamp(),
+                "error_type": "get_status_failed",
+                "message": str(e)
+            })
+        return (b'{"type":"status","data":' + status_body + b'}').decode("utf-8")
+
+    async def _refresh_status_cache(self) -> bytes:
+        """
+        重新计算机器人状态并缓存序列化结果
+
+        状态在事件循环内采集：策略 / 仓位数据只在事件循环中修改，不能在工作线程中遍历；
+        结果有 TTL 缓存，每秒最多采集一次。
+        状态字段（不含时间戳）与上次相同时保留旧响应体与 ETag，
+        客户端携带 If-None-Match 即可持续命中 304；timestamp 表示状态最近一次变化的时间
+        """
+        fields_body = self._collect_status_fields()
+
+        fields_hash = hash(fields_body)
+        if self._status_body is not None and fields_hash == self._status_fields_hash:
+            return self._status_body
+
+        # 在已序列化的状态字段后追加时间戳，无需再次序列化整个状态
+        timestamp = dumps_bytes(self._timestamp())
+        self._status_fields_hash = fields_hash
+        self._status_body = fields_body[:-1] + b',"timestamp":' + timestamp + b'}'
+        self._status_etag = compute_etag(self._status_body)
+        return self._status_body
+
+    def _collect_status_fields(self) -> bytes:
+        """
+        采集机器人状态字段并序列化（不含时间戳）
+
+        PnL 字段按 PNL_DECIMALS 舍入：响应更短，且盈亏的微小浮动不会使 ETag 失效。
+        各入口的 bot 组件不一致（多策略版本没有 strategy，调试用 MockBot 没有 exchange），
+        缺失的组件返回 null
+        """
+        # 每次采集时读取一次 bot 属性并绑定为局部变量（bot.strategy 等可能在运行中被替换，不在 __init__ 中缓存）
+        bot = self.bot
+        strategy = getattr(bot, "strategy", None)
+        exchange = getattr(bot, "exchange", None)
+        position_manager = getattr(bot, "position_manager", None)
+        risk_manager = getattr(bot, "risk_manager", None)
+        fields = self._status_fields
+        fields["status"] = "running" if getattr(bot, "is_running", False) else "stopped"
+        fields["strategy"] = strategy.get_status() if strategy else None
+        fields["positions"] = _round_pnl_fields(position_manager.to_dict()) if position_manager else None
+        fields["risk"] = risk_manager.to_dict() if risk_manager else None
+        fields["exchange"] = exchange.to_dict() if exchange else None
+        return dumps_bytes(fields)
+
+    def _on_instances_changed(self, instance_id: Optional[str]):
+        """
+        策略实例变更：使 /api/strategy-instances 缓存失效并推送 instances_changed 事件，
+        前端收到后再重新拉取实例列表，无需定时轮询
+        """
+        self._instances_body = None
+        self._queue_event({
+            "type": "instances_changed",
+            "data": {"instance_id": instance_id},
+            "timestamp": self._timestamp()
+        })
+
     async def broadcast_event(self, event_type: str, data: dict):
         """广播事件到所有 WebSocket 客户端"""
-        message = json.dumps({
+        self._queue_event({
             "type": event_type,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": self._timestamp()
         })
 
-        for client in self.websocket_clients[:]:
+    async def _forward_bus_event(self, event: Dict):
+        """事件总线回调：将事件转发给所有 WebSocket 客户端"""
+        self._queue_event(event)
+
+    def _queue_event(self, frame: Dict):
+        """
+        加入待推送队列，由后台任务在 EVENT_BATCH_WINDOW 后合并发送：
+        窗口内只有一个事件时发送原始事件帧，多个事件时发送
+        {"type": "events", "batch": [...], "timestamp": ...}
+        """
+        if not self.websocket_clients:
+            return
+
+        self._event_seq += 1
+        if frame.get("type") in _DROPPABLE_EVENT_TYPES:
+            self._pending_market_events.append((self._event_seq, frame))
+        else:
+            self._pending_events.append((self._event_seq, frame))
+        if self._event_flush_task is None or self._event_flush_task.done():
+            self._event_flush_task = asyncio.create_task(self._flush_events())
+
+    async def _flush_events(self):
+        """按合并窗口推送累积的事件，直到队列为空"""
+        while self._pending_events or self._pending_market_events:
+            await asyncio.sleep(EVENT_BATCH_WINDOW)
+            events = [frame for _, frame in heapq.merge(self._pending_events, self._pending_market_events)]
+            self._pending_events = []
+            self._pending_market_events.clear()
+
+            if len(events) == 1:
+                payload = events[0]
+            else:
+                payload = {
+                    "type": "events",
+                    "batch": events,
+                    "timestamp": self._timestamp()
+                }
+            self._send_to_clients(payload)
+
+    def _send_to_clients(self, payload: Dict):
+        """
+        按客户端格式编码消息（每种格式只编码一次）并放入各客户端的发送队列；
+        队列已满的客户端视为消费过慢，直接断开
+        """
+        text_frame = None
+        msgpack_frame = None
+        slow_clients = []
+        for client, queue in self._client_queues.items():
+            if client in self._msgpack_clients:
+                if msgpack_frame is None:
+                    msgpack_frame = packb(payload)
+                frame = msgpack_frame
+            else:
+                if text_frame is None:
+                    text_frame = dumps_text(payload)
+                frame = text_frame
             try:
-                await client.send_text(message)
-            except Exception as e:
-                self.websocket_clients.remove(client)
-                logger.error(f"Failed to send message to client: {e}")
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                slow_clients.append(client)
+
+        for client in slow_clients:
+            self._drop_slow_client(client)
+        if slow_clients:
+            logger.warning("Dropped %d slow WebSocket client(s): send queue full", len(slow_clients))
 
     async def run_async(self, host: str = "0.0.0.0", port: int = 5000):
         """异步运行服务器"""
         import uvicorn
 
-        config = uvicorn.Config(self.app, host=host, port=port)
+        config = uvicorn.Config(self.app, host=host, port=port, **UVICORN_OPTIONS)
         server = uvicorn.Server(config)
         await server.serve()
 
@@ -629,5 +901,5 @@ class WebServer:
         import uvicorn
 
         logger.info(f"Starting web server on {host}:{port}")
-        uvicorn.run(self.app, host=host, port=port)
+        uvicorn.run(self.app, host=host, port=port, **UVICORN_OPTIONS)
 
@@ -3,12 +3,13 @@ WebSocket 管理器 - 统一管理 WebSocket 连接和事件推送
 所有事件从 EventBus 发往 WebSocket 客户端
 支持 snapshot 和多客户端
 """
-import json
 import logging
 from typing import Set, Dict, Any, List
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from ..core.event_bus import EventBus
+from ..core.ws_broadcast import broadcast_text
+from .json_utils import dumps_text
 
 logger = logging.getLogger(__name__)
 
@@ -103,16 +104,14 @@ class WebSocketManager:
         if not self.active_connections:
             return
 
-        message = json.dumps(event)
+        message = dumps_text(event)
 
-        # 发送给所有客户端
-        disconnected_clients = []
-        for client_id, connection in self.active_connections.items():
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error sending to client {client_id}: {e}")
-                disconnected_clients.append(client_id)
+        # 分批并发发送给所有客户端
+        connections = list(self.active_connections.items())
+        failed = set(await broadcast_text((connection for _, connection in connections), message))
+        disconnected_clients = [client_id for client_id, connection in connections if connection in failed]
+        if disconnected_clients:
+            logger.error(f"Error sending to clients: {disconnected_clients}")
 
         # 移除断开的客户端
         for client_id in disconnected_clients:
@@ -143,7 +142,7 @@ class WebSocketManager:
             }
 
             # 发送快照
-            await self.active_connections[client_id].send_text(json.dumps(snapshot_event))
+            await self.active_connections[client_id].send_text(dumps_text(snapshot_event))
             logger.info(f"Snapshot sent to client: {client_id}")
 
         except Exception as e:
@@ -163,9 +162,9 @@ class WebSocketManager:
 
         try:
             if isinstance(message, dict):
-                message = json.dumps(message)
+                message = dumps_text(message)
             elif isinstance(message, (list, dict)):
-                message = json.dumps(message)
+                message = dumps_text(message)
 
             await self.active_connections[client_id].send_text(message)
         except Exception as e: